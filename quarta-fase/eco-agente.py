@@ -1,3 +1,24 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+""""
+necessario rodar o comando `pip install numpy`, caso não tiver instalado essa biblioteca (usada por decidir_lote)
+"""
+
+# Cada fato de percepção vira um bit do estado: bit i <=> FATOS_PERCEPCAO[i] é verdadeiro.
+# Com 4 fatos há só 16 estados possíveis, então as regras podem ser pré-calculadas em uma tabela.
+FATOS_PERCEPCAO = ('PessoaPresente', 'LuzNaturalSuficiente', 'TemperaturaAlta', 'HorarioExpediente')
+# Cada ação vira um bit do código de ações: bit i <=> ACOES[i] foi inferida
+ACOES = ('Ligar a luz artificial.', 'Desligar a luz artificial.',
+         'Ligar o ar-condicionado.', 'Desligar o ar-condicionado.')
+NENHUMA_ACAO = "Nenhuma ação necessária. Manter estado atual."
+
 class EcoAgente:
     """
     Um agente lógico simples para gerenciar a energia de um escritório.
@@ -43,10 +64,143 @@ class EcoAgente:
             acoes.append('Desligar o ar-condicionado.')
             
         if not acoes:
-            return ["Nenhuma ação necessária. Manter estado atual."]
+            return [NENHUMA_ACAO]
 
         return acoes
 
+    def ask_compilado(self):
+        """ Mesmo resultado do ask, consultando a tabela de regras compiladas. """
+        return decodificar_acoes(TABELA_ACOES[codificar_percepcoes({fato: True for fato in self.kb})])
+
+
+def codificar_percepcoes(percepcoes):
+    """Converte o dicionário {fato: bool} em um estado de 4 bits (fatos ausentes contam como falsos)."""
+    estado = 0
+    for bit, fato in enumerate(FATOS_PERCEPCAO):
+        if percepcoes.get(fato):
+            estado |= 1 << bit
+    return estado
+
+def decodificar_acoes(codigo_acoes):
+    """Converte um código de ações na lista de frases que o ask retornaria."""
+    acoes = [acao for bit, acao in enumerate(ACOES) if codigo_acoes & (1 << bit)]
+    return acoes or [NENHUMA_ACAO]
+
+def compilar_regras():
+    """
+    Roda o ask do EcoAgente uma vez para cada um dos 16 estados e guarda o código
+    das ações inferidas; assim a tabela segue sempre as regras R1-R4 do agente.
+    Retorna um array numpy (uint8) indexado pelo estado.
+    """
+    bit_da_acao = {acao: 1 << bit for bit, acao in enumerate(ACOES)}
+    tabela = np.zeros(1 << len(FATOS_PERCEPCAO), dtype=np.uint8)
+    agente = EcoAgente()
+    for estado in range(len(tabela)):
+        agente.tell({fato: bool(estado & (1 << bit)) for bit, fato in enumerate(FATOS_PERCEPCAO)})
+        tabela[estado] = sum(bit_da_acao.get(acao, 0) for acao in agente.ask())
+    return tabela
+
+TABELA_ACOES = compilar_regras()
+
+def codificar_lote(percepcoes):
+    """
+    Converte um array (n, 4) de percepções (bool ou 0/1, colunas na ordem de FATOS_PERCEPCAO)
+    em um array (n,) de estados uint8.
+    """
+    percepcoes = np.asarray(percepcoes)
+    if percepcoes.ndim != 2 or percepcoes.shape[1] != len(FATOS_PERCEPCAO):
+        raise ValueError(f"Esperado um array (n, {len(FATOS_PERCEPCAO)}), recebido {percepcoes.shape}")
+    estados = np.zeros(len(percepcoes), dtype=np.uint8)
+    for bit in range(len(FATOS_PERCEPCAO)):
+        estados |= (percepcoes[:, bit] != 0).astype(np.uint8) << np.uint8(bit)
+    return estados
+
+def decidir_lote(percepcoes):
+    """
+    Decide as ações de muitas leituras de uma vez: recebe o array (n, 4) de percepções
+    e retorna o array (n,) de códigos de ações (uint8), sem laço em Python por leitura.
+    """
+    return TABELA_ACOES[codificar_lote(percepcoes)]
+
+class Regra:
+    """
+    Regra conjuntiva: se todos os fatos em 'condicoes' têm o valor pedido, infere 'acao'.
+    Regras com "ou" (como R2 e R4) viram uma regra por termo, todas com a mesma ação.
+    """
+    def __init__(self, nome, condicoes, acao):
+        self.nome = nome
+        self.condicoes = condicoes # Dicionário {fato: valor_exigido}
+        self.acao = acao
+
+REGRAS_ECOAGENTE = [
+    Regra('R1', {'PessoaPresente': True, 'LuzNaturalSuficiente': False}, 'Ligar a luz artificial.'),
+    Regra('R2a', {'PessoaPresente': False}, 'Desligar a luz artificial.'),
+    Regra('R2b', {'LuzNaturalSuficiente': True}, 'Desligar a luz artificial.'),
+    Regra('R3', {'PessoaPresente': True, 'TemperaturaAlta': True, 'HorarioExpediente': True},
+          'Ligar o ar-condicionado.'),
+    Regra('R4a', {'PessoaPresente': False}, 'Desligar o ar-condicionado.'),
+    Regra('R4b', {'HorarioExpediente': False}, 'Desligar o ar-condicionado.'),
+]
+
+class MotorRegrasIncremental:
+    """
+    Encadeamento para frente incremental (no estilo Rete): as regras são indexadas pelos
+    fatos que citam, e cada regra guarda quantas condições estão satisfeitas. Um tell com
+    as mudanças de fatos só reavalia as regras que citam os fatos alterados, e cada ação
+    guarda quantas regras a sustentam; o tell retorna só as ações que mudaram.
+    Fatos nunca informados valem False, como na KB do EcoAgente.
+    """
+    def __init__(self, regras=REGRAS_ECOAGENTE):
+        self.regras = regras
+        self.fatos = {}
+        self.indice = {} # {fato: [(indice_regra, valor_exigido), ...]}
+        self.satisfeitas = [] # Condições satisfeitas de cada regra
+        self.suporte = {} # {acao: número de regras ativas que a inferem}
+        self.ordem_acoes = [] # Ordem em que as ações aparecem nas regras (a mesma do ask)
+
+        for indice_regra, regra in enumerate(regras):
+            for fato, valor_exigido in regra.condicoes.items():
+                self.indice.setdefault(fato, []).append((indice_regra, valor_exigido))
+            # Todos os fatos começam falsos: as condições negativas já estão satisfeitas
+            self.satisfeitas.append(sum(1 for valor_exigido in regra.condicoes.values() if not valor_exigido))
+            if regra.acao not in self.suporte:
+                self.suporte[regra.acao] = 0
+                self.ordem_acoes.append(regra.acao)
+            if self.satisfeitas[indice_regra] == len(regra.condicoes):
+                self.suporte[regra.acao] += 1
+
+    def tell(self, mudancas):
+        """
+        Aplica as mudanças {fato: bool} (pode ser a leitura completa; fatos que não mudaram
+        são ignorados) e retorna a lista de (acao, ativa) das ações que mudaram.
+        """
+        suporte_antes = {}
+        for fato, valor in mudancas.items():
+            valor = bool(valor)
+            valor_antigo = self.fatos.get(fato, False)
+            if valor == valor_antigo:
+                continue
+            self.fatos[fato] = valor
+            for indice_regra, valor_exigido in self.indice.get(fato, ()):
+                regra = self.regras[indice_regra]
+                estava_ativa = self.satisfeitas[indice_regra] == len(regra.condicoes)
+                self.satisfeitas[indice_regra] += 1 if valor == valor_exigido else -1
+                ativa = self.satisfeitas[indice_regra] == len(regra.condicoes)
+                if ativa != estava_ativa:
+                    suporte_antes.setdefault(regra.acao, self.suporte[regra.acao])
+                    self.suporte[regra.acao] += 1 if ativa else -1
+
+        # Uma ação só muda se passou de zero para algum suporte (ou o contrário)
+        return [(acao, self.suporte[acao] > 0) for acao, antes in suporte_antes.items()
+                if (antes > 0) != (self.suporte[acao] > 0)]
+
+    def acoes_ativas(self):
+        return [acao for acao in self.ordem_acoes if self.suporte[acao] > 0]
+
+    def ask(self):
+        """ Lista completa de ações, no mesmo formato do EcoAgente.ask. """
+        return self.acoes_ativas() or [NENHUMA_ACAO]
+
 def simular_cenario(nome_cenario, percepcoes):
     """Função auxiliar para executar e imprimir um cenário de simulação."""
     print(f"--- {nome_cenario} ---")
@@ -62,40 +216,322 @@ def simular_cenario(nome_cenario, percepcoes):
     print("-" * 25 + "\n")
 
 
-# Simulacao
-
-# Cenario 1: Dia de trabalho quente e com pouca luz
-cenario_1 = {
-    'PessoaPresente': True,
-    'LuzNaturalSuficiente': False,
-    'TemperaturaAlta': True,
-    'HorarioExpediente': True
-}
-simular_cenario("Cenário 1: Dia de trabalho, quente e escuro", cenario_1)
-
-# Cenario 2: Sala vazia durante o expediente
-cenario_2 = {
-    'PessoaPresente': False,
-    'LuzNaturalSuficiente': True,
-    'TemperaturaAlta': True,
-    'HorarioExpediente': True
-}
-simular_cenario("Cenário 2: Sala vazia no horário de expediente", cenario_2)
-
-# Cenario 3: Fim do expediente, mas alguém ficou na sala
-cenario_3 = {
-    'PessoaPresente': True,
-    'LuzNaturalSuficiente': False,
-    'TemperaturaAlta': True,
-    'HorarioExpediente': False
-}
-simular_cenario("Cenário 3: Fora do expediente com pessoa na sala", cenario_3)
-
-# Cenario 4: Dia de trabalho com clima agradável e boa luz
-cenario_4 = {
-    'PessoaPresente': True,
-    'LuzNaturalSuficiente': True,
-    'TemperaturaAlta': False,
-    'HorarioExpediente': True
-}
-simular_cenario("Cenário 4: Condições ideais de luz e temperatura", cenario_4)
\ No newline at end of file
+# Serviço de streaming: muitas salas, eventos de sensores chegando por socket ou arquivo
+
+# Tabela compilada como tupla de int: consulta escalar mais rápida que indexar o array numpy
+TABELA_ACOES_ESCALAR = tuple(int(codigo) for codigo in TABELA_ACOES)
+BIT_DO_FATO = {fato: 1 << bit for bit, fato in enumerate(FATOS_PERCEPCAO)}
+INTERVALO_TICK = 0.05 # Segundos entre duas rodadas de decisão
+TAMANHO_FILA_EVENTOS = 10000 # Fila cheia faz os leitores esperarem (backpressure)
+MAX_EVENTOS_POR_TICK = 50000
+BYTES_POR_LEITURA = 1 << 16 # Bytes pedidos por leitura de arquivo (readlines com dica de tamanho)
+
+class AgenteSala:
+    """
+    Agente compacto de uma sala: o estado dos 4 fatos e o código das ações vigentes são
+    inteiros, e a decisão é uma consulta à tabela compilada, sem alocar nada por evento.
+    """
+    __slots__ = ('sala', 'estado', 'codigo_acoes', 'primeiro_pendente', 'eventos',
+                 'decisoes', 'mudancas_emitidas', 'latencia_total', 'latencia_maxima')
+
+    def __init__(self, sala):
+        self.sala = sala
+        self.estado = 0
+        self.codigo_acoes = None # Nada publicado ainda: a primeira decisão sai sempre
+        self.primeiro_pendente = None # Instante de chegada do evento mais antigo ainda sem decisão
+        self.eventos = 0
+        self.decisoes = 0
+        self.mudancas_emitidas = 0
+        self.latencia_total = 0.0
+        self.latencia_maxima = 0.0
+
+    def aplicar(self, bits_ligados, bits_desligados, instante):
+        """Atualiza os fatos da sala com um evento (a decisão fica para o fim do tick)."""
+        self.estado = (self.estado | bits_ligados) & ~bits_desligados
+        self.eventos += 1
+        if self.primeiro_pendente is None:
+            self.primeiro_pendente = instante
+
+    def decidir(self, agora):
+        """
+        Decide com o estado atual e retorna (ativar, desativar) como códigos de ações,
+        só com o que mudou desde a última decisão, ou None se nada mudou. A primeira
+        decisão da sala sempre é retornada, com todas as ações vigentes em 'ativar'.
+        """
+        novo_codigo = TABELA_ACOES_ESCALAR[self.estado]
+        if self.codigo_acoes is None:
+            ativar, desativar = novo_codigo, 0
+            publicar = True
+        else:
+            ativar = novo_codigo & ~self.codigo_acoes
+            desativar = self.codigo_acoes & ~novo_codigo
+            publicar = bool(ativar or desativar)
+        self.codigo_acoes = novo_codigo
+
+        latencia = agora - self.primeiro_pendente
+        self.primeiro_pendente = None
+        self.decisoes += 1
+        self.latencia_total += latencia
+        if latencia > self.latencia_maxima:
+            self.latencia_maxima = latencia
+        if not publicar:
+            return None
+        self.mudancas_emitidas += 1
+        return ativar, desativar
+
+    def metricas(self):
+        return {
+            'eventos': self.eventos,
+            'decisoes': self.decisoes,
+            'mudancas_emitidas': self.mudancas_emitidas,
+            'latencia_media_ms': 1000 * self.latencia_total / self.decisoes if self.decisoes else None,
+            'latencia_maxima_ms': 1000 * self.latencia_maxima,
+        }
+
+def interpretar_evento(linha):
+    """
+    Converte uma linha JSON {"sala": ..., "percepcoes": {fato: bool}} em
+    (sala, bits_ligados, bits_desligados). Retorna None para linhas inválidas.
+    """
+    try:
+        evento = json.loads(linha)
+        sala = str(evento['sala'])
+        percepcoes = evento['percepcoes']
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(percepcoes, dict):
+        return None
+    bits_ligados = bits_desligados = 0
+    for fato, valor in percepcoes.items():
+        bit = BIT_DO_FATO.get(fato)
+        if bit is None:
+            continue # Fato que as regras não usam
+        if valor:
+            bits_ligados |= bit
+        else:
+            bits_desligados |= bit
+    return sala, bits_ligados, bits_desligados
+
+class ServicoEcoAgente:
+    """
+    Runtime asyncio para muitas salas. Leitores (conexões de socket ou um arquivo) colocam
+    os eventos numa fila limitada; a cada tick o laço de decisão esvazia a fila, atualiza
+    os agentes das salas e decide uma vez por sala alterada, emitindo só as ações que mudaram.
+    """
+    def __init__(self, saida=None, intervalo_tick=INTERVALO_TICK, tamanho_fila=TAMANHO_FILA_EVENTOS,
+                 max_eventos_por_tick=MAX_EVENTOS_POR_TICK):
+        self.saida = saida or sys.stdout # Recebe uma linha JSON por sala com mudança
+        self.intervalo_tick = intervalo_tick
+        self.tamanho_fila = tamanho_fila
+        self.max_eventos_por_tick = max_eventos_por_tick
+        self.salas = {}
+        self.fila = None # Criada dentro do laço de eventos
+        self.leitores_ativos = 0
+        self.ticks = 0
+        self.eventos_invalidos = 0
+        self.maior_fila = 0
+
+    async def enfileirar(self, linha, instante):
+        evento = interpretar_evento(linha)
+        if evento is None:
+            self.eventos_invalidos += 1
+            return
+        # put espera quando a fila está cheia: o leitor para de ler e o produtor é freado
+        await self.fila.put((evento[0], evento[1], evento[2], instante))
+
+    async def ler_conexao(self, leitor, escritor):
+        """Trata uma conexão de socket: uma linha JSON por evento."""
+        self.leitores_ativos += 1
+        try:
+            while linha := await leitor.readline():
+                await self.enfileirar(linha, time.perf_counter())
+        finally:
+            self.leitores_ativos -= 1
+            escritor.close()
+
+    async def ler_arquivo(self, caminho):
+        """Lê eventos de um arquivo (ou '-' para a entrada padrão) em blocos, fora do laço de eventos."""
+        self.leitores_ativos += 1
+        arquivo = sys.stdin if caminho == '-' else open(caminho, encoding='utf-8')
+        try:
+            while linhas := await asyncio.to_thread(arquivo.readlines, BYTES_POR_LEITURA):
+                for linha in linhas:
+                    await self.enfileirar(linha, time.perf_counter())
+        finally:
+            self.leitores_ativos -= 1
+            if arquivo is not sys.stdin:
+                arquivo.close()
+
+    async def laco_decisoes(self, parar_quando_ocioso=False):
+        """
+        A cada tick: aplica até max_eventos_por_tick eventos, decide uma vez por sala
+        alterada e escreve as mudanças de uma vez. Com parar_quando_ocioso, termina quando
+        não há mais leitores nem eventos na fila (modo arquivo).
+        """
+        while True:
+            inicio_tick = time.perf_counter()
+            alteradas = {}
+            self.maior_fila = max(self.maior_fila, self.fila.qsize())
+            for _ in range(min(self.fila.qsize(), self.max_eventos_por_tick)):
+                sala, bits_ligados, bits_desligados, instante = self.fila.get_nowait()
+                agente = self.salas.get(sala)
+                if agente is None:
+                    agente = self.salas[sala] = AgenteSala(sala)
+                agente.aplicar(bits_ligados, bits_desligados, instante)
+                alteradas[sala] = agente
+
+            if alteradas:
+                agora = time.perf_counter()
+                linhas = []
+                for agente in alteradas.values():
+                    mudanca = agente.decidir(agora)
+                    if mudanca is not None:
+                        ativar, desativar = mudanca
+                        linhas.append(json.dumps({
+                            'sala': agente.sala,
+                            'ativar': [acao for bit, acao in enumerate(ACOES) if ativar & (1 << bit)],
+                            'desativar': [acao for bit, acao in enumerate(ACOES) if desativar & (1 << bit)],
+                        }, ensure_ascii=False))
+                if linhas:
+                    # Escrever fora do laço: se a saída estiver lenta, o tick espera e a fila enche
+                    await asyncio.to_thread(self.escrever, "\n".join(linhas) + "\n")
+            self.ticks += 1
+
+            if parar_quando_ocioso and self.leitores_ativos == 0 and self.fila.empty():
+                return
+            await asyncio.sleep(max(0.0, self.intervalo_tick - (time.perf_counter() - inicio_tick)))
+
+    def escrever(self, texto):
+        self.saida.write(texto)
+        self.saida.flush()
+
+    async def executar_arquivo(self, caminho):
+        """Processa um arquivo de eventos até o fim e retorna as métricas."""
+        self.fila = asyncio.Queue(self.tamanho_fila)
+        leitura = asyncio.create_task(self.ler_arquivo(caminho))
+        await asyncio.sleep(0) # Deixa o leitor se registrar antes do laço checar se está ocioso
+        await self.laco_decisoes(parar_quando_ocioso=True)
+        await leitura
+        return self.metricas()
+
+    async def executar_socket(self, host, porta):
+        """Atende conexões TCP em host:porta até ser cancelado."""
+        self.fila = asyncio.Queue(self.tamanho_fila)
+        servidor = await asyncio.start_server(self.ler_conexao, host, porta)
+        async with servidor:
+            await asyncio.gather(servidor.serve_forever(), self.laco_decisoes())
+
+    def metricas(self):
+        """Métricas gerais e por sala (eventos, decisões, mudanças emitidas e latência)."""
+        return {
+            'ticks': self.ticks,
+            'salas': len(self.salas),
+            'eventos': sum(agente.eventos for agente in self.salas.values()),
+            'eventos_invalidos': self.eventos_invalidos,
+            'maior_fila': self.maior_fila,
+            'latencia_maxima_ms': max((1000 * agente.latencia_maxima for agente in self.salas.values()), default=0.0),
+            'por_sala': {sala: agente.metricas() for sala, agente in self.salas.items()},
+        }
+
+def imprimir_resumo_metricas(metricas):
+    """Escreve as métricas gerais (sem o detalhe por sala) na saída de erro."""
+    resumo = {chave: valor for chave, valor in metricas.items() if chave != 'por_sala'}
+    print(json.dumps(resumo, ensure_ascii=False), file=sys.stderr)
+
+def gerar_eventos_sinteticos(caminho, numero_salas, numero_eventos, semente=None):
+    """Grava um arquivo de eventos aleatórios (uma linha JSON por evento) para testar o serviço."""
+    gerador = random.Random(semente)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for _ in range(numero_eventos):
+            fato = gerador.choice(FATOS_PERCEPCAO)
+            arquivo.write(json.dumps({'sala': f"sala-{gerador.randrange(numero_salas)}",
+                                      'percepcoes': {fato: gerador.random() < 0.5}}) + "\n")
+
+def executar_demonstracoes():
+    """Cenários fixos do agente, da tabela compilada e do motor incremental."""
+    # Simulacao
+
+    # Cenario 1: Dia de trabalho quente e com pouca luz
+    cenario_1 = {
+        'PessoaPresente': True,
+        'LuzNaturalSuficiente': False,
+        'TemperaturaAlta': True,
+        'HorarioExpediente': True
+    }
+    simular_cenario("Cenário 1: Dia de trabalho, quente e escuro", cenario_1)
+
+    # Cenario 2: Sala vazia durante o expediente
+    cenario_2 = {
+        'PessoaPresente': False,
+        'LuzNaturalSuficiente': True,
+        'TemperaturaAlta': True,
+        'HorarioExpediente': True
+    }
+    simular_cenario("Cenário 2: Sala vazia no horário de expediente", cenario_2)
+
+    # Cenario 3: Fim do expediente, mas alguém ficou na sala
+    cenario_3 = {
+        'PessoaPresente': True,
+        'LuzNaturalSuficiente': False,
+        'TemperaturaAlta': True,
+        'HorarioExpediente': False
+    }
+    simular_cenario("Cenário 3: Fora do expediente com pessoa na sala", cenario_3)
+
+    # Cenario 4: Dia de trabalho com clima agradável e boa luz
+    cenario_4 = {
+        'PessoaPresente': True,
+        'LuzNaturalSuficiente': True,
+        'TemperaturaAlta': False,
+        'HorarioExpediente': True
+    }
+    simular_cenario("Cenário 4: Condições ideais de luz e temperatura", cenario_4)
+
+    # Simulacao em lote: as mesmas leituras avaliadas de uma vez pela tabela compilada
+    leituras = np.array([[cenario[fato] for fato in FATOS_PERCEPCAO]
+                         for cenario in (cenario_1, cenario_2, cenario_3, cenario_4)])
+    print("--- Decisão em lote (regras compiladas) ---")
+    for numero, codigo in enumerate(decidir_lote(leituras), start=1):
+        print(f"Cenário {numero}: código {int(codigo):04b} -> {decodificar_acoes(int(codigo))}")
+
+    # Simulacao incremental: só os sensores que mudaram são informados a cada leitura
+    print("\n--- Motor incremental (apenas mudanças) ---")
+    motor = MotorRegrasIncremental()
+    motor.tell(cenario_1)
+    print(f"Início (Cenário 1): {motor.ask()}")
+    for descricao, mudancas in [("Pessoa saiu da sala", {'PessoaPresente': False}),
+                                ("Pessoa voltou", {'PessoaPresente': True}),
+                                ("Sol apareceu", {'LuzNaturalSuficiente': True}),
+                                ("Fim do expediente", {'HorarioExpediente': False})]:
+        alteracoes = motor.tell(mudancas)
+        print(f"{descricao}: " + (", ".join(f"{'ATIVAR' if ativa else 'DESATIVAR'} '{acao}'"
+                                            for acao, ativa in alteracoes) or "nenhuma mudança"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EcoAgente: demonstrações ou serviço de streaming por sala")
+    parser.add_argument("--arquivo", help="processa eventos (JSON por linha) deste arquivo ou '-' (entrada padrão)")
+    parser.add_argument("--porta", type=int, help="atende eventos por TCP nesta porta")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--intervalo-tick", type=float, default=INTERVALO_TICK)
+    parser.add_argument("--gerar-eventos", nargs=3, metavar=("ARQUIVO", "SALAS", "EVENTOS"),
+                        help="grava um arquivo de eventos sintéticos e sai")
+    argumentos = parser.parse_args()
+
+    if argumentos.gerar_eventos:
+        caminho, salas, eventos = argumentos.gerar_eventos
+        gerar_eventos_sinteticos(caminho, int(salas), int(eventos), semente=42)
+    elif argumentos.arquivo:
+        # As ações vão para a saída padrão; o resumo das métricas vai para a saída de erro
+        servico = ServicoEcoAgente(intervalo_tick=argumentos.intervalo_tick)
+        imprimir_resumo_metricas(asyncio.run(servico.executar_arquivo(argumentos.arquivo)))
+    elif argumentos.porta:
+        # O serviço roda até Ctrl+C; ao parar, o resumo das métricas vai para a saída de erro
+        servico = ServicoEcoAgente(intervalo_tick=argumentos.intervalo_tick)
+        try:
+            asyncio.run(servico.executar_socket(argumentos.host, argumentos.porta))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            imprimir_resumo_metricas(servico.metricas())
+    else:
+        executar_demonstracoes()
\ No newline at end of file
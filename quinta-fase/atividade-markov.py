@@ -1,3 +1,6 @@
+import collections
+import multiprocessing
+
 import numpy as np
 from hmmlearn import hmm
 
@@ -42,34 +45,307 @@ P(estado_inicial=i)
 
 start_probs = np.array([0.6, 0.4])
 
-"""
-Criar o modelo HMM
-n_components: número de estados ocultos
-n_iter: número de iterações para o algoritmo de aprendizado (se estivéssemos treinando)
-verbose: para ver o progresso (coloque True para depuração)
-"""
-model = hmm.CategoricalHMM(n_components=2, random_state=42, n_iter=100)
-model.startprob_ = start_probs
-model.transmat_ = trans_matrix
-model.emissionprob_ = emission_matrix
+def viterbi_lote(observacoes, comprimentos, start_probs, trans_matrix, emission_matrix):
+    """
+    Viterbi em espaço log para um lote de sequências de uma vez (vetorizado no lote).
+    observacoes: array (n_sequencias, T_max) de símbolos inteiros, preenchido após o fim de cada sequência
+    comprimentos: array (n_sequencias,) com o tamanho real de cada sequência (>= 1)
+    Retorna (log_probabilidades, estados): log P(observações, caminho mais provável) de cada
+    sequência, como o model.decode, e os estados (n_sequencias, T_max) com -1 no preenchimento.
+    """
+    observacoes = np.asarray(observacoes)
+    comprimentos = np.asarray(comprimentos)
+    n_sequencias, t_max = observacoes.shape
+    with np.errstate(divide="ignore"): # log(0) = -inf: transições impossíveis
+        log_inicio = np.log(start_probs)
+        log_transicao = np.log(trans_matrix)
+        log_emissao_por_simbolo = np.log(emission_matrix).T # (n_simbolos, n_estados)
+
+    linhas = np.arange(n_sequencias)
+    # Posições de preenchimento usam o símbolo 0 só para indexar; o resultado delas é descartado
+    simbolos = np.where(np.arange(t_max) < comprimentos[:, None], observacoes, 0)
+    log_delta = log_inicio + log_emissao_por_simbolo[simbolos[:, 0]]
+    # psi[:, t, j]: melhor estado anterior para estar em j no tempo t (int8 basta para poucos estados)
+    psi = np.zeros((n_sequencias, t_max, len(start_probs)), dtype=np.min_scalar_type(len(start_probs)))
+    for t in range(1, t_max):
+        pontuacoes = log_delta[:, :, None] + log_transicao # (n_sequencias, de, para)
+        psi[:, t] = np.argmax(pontuacoes, axis=1)
+        novo_log_delta = pontuacoes[linhas[:, None], psi[:, t], np.arange(len(start_probs))] + \
+                         log_emissao_por_simbolo[simbolos[:, t]]
+        # Sequências que já acabaram ficam com o delta do último passo delas
+        log_delta = np.where((t < comprimentos)[:, None], novo_log_delta, log_delta)
+
+    estado_atual = np.argmax(log_delta, axis=1)
+    log_probabilidades = log_delta[linhas, estado_atual]
+    estados = np.full((n_sequencias, t_max), -1, dtype=int)
+    for t in range(t_max - 1, -1, -1):
+        ativa = t < comprimentos
+        estados[ativa, t] = estado_atual[ativa]
+        if t > 0:
+            estado_atual = np.where(ativa, psi[linhas, t, estado_atual], estado_atual)
+    return log_probabilidades, estados
+
+def preencher_sequencias(sequencias, valor=0):
+    """Empilha sequências de tamanhos diferentes em (n_sequencias, T_max) e retorna (observacoes, comprimentos)."""
+    comprimentos = np.array([len(sequencia) for sequencia in sequencias])
+    observacoes = np.full((len(sequencias), comprimentos.max()), valor, dtype=int)
+    for i, sequencia in enumerate(sequencias):
+        observacoes[i, :len(sequencia)] = np.ravel(sequencia)
+    return observacoes, comprimentos
+
+class DecodificadorHMMOnline:
+    """
+    Decodificador de fluxo para o HMM: consome uma observação por vez.
+    A cada observação devolve na hora as probabilidades filtradas P(estado_t | obs_0..t)
+    (vetor forward normalizado) e, com 'atraso' passos de defasagem, confirma o estado
+    do Viterbi para o tempo t - atraso. Só guarda os últimos 'atraso' vetores de
+    ponteiros do Viterbi, então a memória é O(estados x atraso) para fluxos sem fim.
+    """
+    def __init__(self, start_probs, trans_matrix, emission_matrix, atraso=5):
+        self.start_probs = np.asarray(start_probs, dtype=float)
+        self.trans_matrix = np.asarray(trans_matrix, dtype=float)
+        self.emission_matrix = np.asarray(emission_matrix, dtype=float)
+        with np.errstate(divide="ignore"):
+            self.log_inicio = np.log(self.start_probs)
+            self.log_transicao = np.log(self.trans_matrix)
+            self.log_emissao = np.log(self.emission_matrix)
+        self.atraso = int(atraso)
+        self.estados = np.arange(len(self.start_probs))
+        self.t = -1 # Tempo da última observação consumida
+        self.alfa = None # Vetor forward normalizado
+        self.log_verossimilhanca = 0.0 # log P(obs_0..t), acumulada pelos fatores de normalização
+        self.log_delta = None # Viterbi, deslocado pelo máximo para não perder precisão
+        self.ponteiros = collections.deque(maxlen=self.atraso) # psi dos tempos t-atraso+1 .. t
+        self.ultimo_confirmado = -1
+
+    def processar(self, observacao):
+        """
+        Consome uma observação e retorna (probabilidades_filtradas, decisao), em que decisao é
+        (tempo, estado) confirmado pelo Viterbi com atraso, ou None enquanto o atraso não passou.
+        """
+        self.t += 1
+        if self.t == 0:
+            alfa = self.start_probs * self.emission_matrix[:, observacao]
+            log_delta = self.log_inicio + self.log_emissao[:, observacao]
+        else:
+            alfa = (self.alfa @ self.trans_matrix) * self.emission_matrix[:, observacao]
+            pontuacoes = self.log_delta[:, None] + self.log_transicao # (de, para)
+            psi = np.argmax(pontuacoes, axis=0)
+            log_delta = pontuacoes[psi, self.estados] + self.log_emissao[:, observacao]
+            self.ponteiros.append(psi)
+
+        normalizador = alfa.sum()
+        if normalizador == 0:
+            raise ValueError(f"Observação {observacao} impossível para o modelo no tempo {self.t}")
+        self.alfa = alfa / normalizador
+        self.log_verossimilhanca += np.log(normalizador)
+        self.log_delta = log_delta - log_delta.max()
+
+        decisao = None
+        if self.t - self.atraso > self.ultimo_confirmado:
+            # Com atraso 0 o deque não guarda nada e o estado confirmado é o argmax atual
+            estado = self.retroceder()[0]
+            self.ultimo_confirmado = self.t - self.atraso
+            decisao = (self.ultimo_confirmado, estado)
+        return self.alfa, decisao
+
+    def retroceder(self):
+        """Estados do Viterbi do tempo mais antigo guardado até t, a partir do melhor estado atual."""
+        estado = int(np.argmax(self.log_delta))
+        caminho = [estado]
+        for psi in reversed(self.ponteiros):
+            estado = int(psi[estado])
+            caminho.append(estado)
+        caminho.reverse()
+        return caminho # caminho[0] é o tempo t - len(ponteiros)
+
+    def finalizar(self):
+        """Fim do fluxo: confirma os estados que ainda estavam dentro da janela de atraso."""
+        if self.t < 0:
+            return []
+        caminho = self.retroceder()
+        primeiro_tempo = self.t - len(self.ponteiros)
+        decisoes = [(primeiro_tempo + i, estado) for i, estado in enumerate(caminho)
+                    if primeiro_tempo + i > self.ultimo_confirmado]
+        self.ultimo_confirmado = self.t
+        return decisoes
+
+def estatisticas_suficientes(observacoes, comprimentos, start_probs, trans_matrix, emission_matrix):
+    """
+    Passo E do Baum-Welch para um bloco de sequências (preenchidas, como no viterbi_lote),
+    com forward-backward escalado e vetorizado no bloco.
+    Retorna as contagens esperadas, que podem ser somadas entre blocos:
+    {'inicio': (estados,), 'transicoes': (estados, estados), 'emissoes': (estados, simbolos),
+     'log_verossimilhanca': float}
+    """
+    observacoes = np.asarray(observacoes)
+    comprimentos = np.asarray(comprimentos)
+    n_sequencias, t_max = observacoes.shape
+    n_estados, n_simbolos = emission_matrix.shape
+    ativa = np.arange(t_max) < comprimentos[:, None] # (n_sequencias, t_max)
+    simbolos = np.where(ativa, observacoes, 0)
+    emissao = emission_matrix.T[simbolos] # (n_sequencias, t_max, estados): P(obs_t | estado)
+
+    # Forward escalado: alfa[:, t] soma 1 e escala[:, t] guarda o fator de normalização
+    alfa = np.zeros((n_sequencias, t_max, n_estados))
+    escala = np.ones((n_sequencias, t_max))
+    alfa_t = start_probs * emissao[:, 0]
+    for t in range(t_max):
+        if t > 0:
+            alfa_t = (alfa[:, t - 1] @ trans_matrix) * emissao[:, t]
+        soma = alfa_t.sum(axis=1)
+        escala[:, t] = np.where(ativa[:, t], soma, 1.0)
+        alfa[:, t] = np.where(ativa[:, t, None], alfa_t / escala[:, t, None], 0.0)
+
+    # Backward com os mesmos fatores; vale 1 no último passo de cada sequência e depois dele
+    beta = np.ones((n_sequencias, t_max, n_estados))
+    transicoes = np.zeros((n_estados, n_estados))
+    for t in range(t_max - 2, -1, -1):
+        proximo = emissao[:, t + 1] * beta[:, t + 1] / escala[:, t + 1, None] # (n_sequencias, estados)
+        transicao_ativa = ativa[:, t + 1, None]
+        beta[:, t] = np.where(transicao_ativa, proximo @ trans_matrix.T, 1.0)
+        # xi_t(i, j) = alfa_t(i) A(i, j) B_j(obs_t+1) beta_t+1(j) / escala_t+1, somado no bloco
+        transicoes += trans_matrix * (np.where(transicao_ativa, alfa[:, t], 0.0).T @ proximo)
+
+    gama = alfa * beta # Zero no preenchimento, porque alfa é zero lá
+    emissoes = np.zeros((n_estados, n_simbolos))
+    for simbolo in range(n_simbolos):
+        emissoes[:, simbolo] = gama[simbolos == simbolo].sum(axis=0)
+    return {
+        'inicio': gama[:, 0].sum(axis=0),
+        'transicoes': transicoes,
+        'emissoes': emissoes,
+        'log_verossimilhanca': float(np.log(escala).sum()),
+    }
+
+def somar_estatisticas(estatisticas_a, estatisticas_b):
+    """Junta as contagens esperadas de dois blocos (a soma é tudo que o passo M precisa)."""
+    return {chave: estatisticas_a[chave] + estatisticas_b[chave] for chave in estatisticas_a}
+
+def passo_m(estatisticas, start_probs, trans_matrix, emission_matrix):
+    """Normaliza as contagens em novas probabilidades; linhas sem contagem mantêm o valor anterior."""
+    def normalizar(contagens, anterior):
+        totais = contagens.sum(axis=-1, keepdims=True)
+        return np.where(totais > 0, contagens / np.where(totais > 0, totais, 1.0), anterior)
+    return (normalizar(estatisticas['inicio'], start_probs),
+            normalizar(estatisticas['transicoes'], trans_matrix),
+            normalizar(estatisticas['emissoes'], emission_matrix))
+
+def estatisticas_do_bloco(parametros):
+    """Ponto de entrada do processo trabalhador: (observacoes, comprimentos, start, trans, emission)."""
+    return estatisticas_suficientes(*parametros)
+
+def treinar_baum_welch_paralelo(sequencias, start_probs, trans_matrix, emission_matrix, n_iter=100,
+                                tol=1e-4, processos=None, sequencias_por_bloco=1000):
+    """
+    Treina o HMM por EM (Baum-Welch) dividindo as sequências em blocos entre processos.
+    Cada tarefa do pool leva um único bloco com os parâmetros atuais e devolve as contagens
+    esperadas dele, então nenhum processo trabalhador guarda o conjunto inteiro.
+    O processo principal soma as contagens e faz o passo M.
+    Para quando a log-verossimilhança melhora menos que tol.
+    Retorna (start_probs, trans_matrix, emission_matrix, historico_log_verossimilhanca).
+    """
+    blocos = [preencher_sequencias(sequencias[inicio:inicio + sequencias_por_bloco])
+              for inicio in range(0, len(sequencias), sequencias_por_bloco)]
+    historico = []
+    with multiprocessing.Pool(processos) as pool:
+        for _ in range(n_iter):
+            parametros = ((observacoes, comprimentos, start_probs, trans_matrix, emission_matrix)
+                          for observacoes, comprimentos in blocos)
+            estatisticas = None
+            for estatisticas_bloco in pool.imap_unordered(estatisticas_do_bloco, parametros):
+                estatisticas = estatisticas_bloco if estatisticas is None else \
+                               somar_estatisticas(estatisticas, estatisticas_bloco)
+            historico.append(estatisticas['log_verossimilhanca'])
+            start_probs, trans_matrix, emission_matrix = passo_m(estatisticas, start_probs,
+                                                                 trans_matrix, emission_matrix)
+            if len(historico) > 1 and historico[-1] - historico[-2] < tol:
+                break
+    return start_probs, trans_matrix, emission_matrix, historico
+
+def amostrar_sequencias(numero_sequencias, comprimento, start_probs, trans_matrix, emission_matrix, semente=None):
+    """Gera sequências de observações (arrays de símbolos) simulando o HMM."""
+    gerador = np.random.default_rng(semente)
+    estados = np.empty((numero_sequencias, comprimento), dtype=int)
+    estados[:, 0] = gerador.choice(len(start_probs), size=numero_sequencias, p=start_probs)
+    for t in range(1, comprimento):
+        # Amostragem vetorizada: compara um uniforme com a distribuição acumulada de cada linha
+        acumulada = np.cumsum(trans_matrix[estados[:, t - 1]], axis=1)
+        estados[:, t] = (gerador.random((numero_sequencias, 1)) > acumulada).sum(axis=1)
+    acumulada_emissao = np.cumsum(emission_matrix[estados], axis=2)
+    observacoes = (gerador.random((numero_sequencias, comprimento, 1)) > acumulada_emissao).sum(axis=2)
+    return list(observacoes)
+
+# Demonstrações sob o __main__: os processos trabalhadores do treinamento paralelo
+# reimportam este arquivo e não devem repeti-las.
+if __name__ == "__main__":
+    """
+    Criar o modelo HMM
+    n_components: número de estados ocultos
+    n_iter: número de iterações para o algoritmo de aprendizado (se estivéssemos treinando)
+    verbose: para ver o progresso (coloque True para depuração)
+    """
+    model = hmm.CategoricalHMM(n_components=2, random_state=42, n_iter=100)
+    model.startprob_ = start_probs
+    model.transmat_ = trans_matrix
+    model.emissionprob_ = emission_matrix
+
+    # Simular uma sequência de observações (o que o sensor detecta)
+    # Uma sequência de 5 minutos, a cada minuto
+    # 0 = 'Movimento Detectado', 1 = 'Sem Movimento'
+    # Observações: [Detectado, Não Detectado, Detectado, Detectado, Não Detectado]
+
+    observations = np.array([[0], [1], [0], [0], [1]])
+
+    print("Sequência de Observações (0=Detectado, 1=Não Detectado):\n", observations.T)
+
+    # aqui prever a sequência de estados ocultos mais provável
+    # O metodo predict usa o algoritmo de Viterbi para encontrar a sequência mais provável.
+    logprob, hidden_states = model.decode(observations, algorithm="viterbi")
 
-# Simular uma sequência de observações (o que o sensor detecta)
-# Uma sequência de 5 minutos, a cada minuto
-# 0 = 'Movimento Detectado', 1 = 'Sem Movimento'
-# Observações: [Detectado, Não Detectado, Detectado, Detectado, Não Detectado]
+    print("\nLog-probabilidade da sequência observada:", logprob)
+    print("Sequência de Estados Ocultos Inferred (0=Andando, 1=Parado):\n", hidden_states)
 
-observations = np.array([[0], [1], [0], [0], [1]])
+    # Traduzir os estados para algo legivel
+    state_map = {0: 'Andando', 1: 'Parado'}
+    inferred_activity = [state_map[s] for s in hidden_states]
+    print("\nAtividade Inferida (mais provável):\n", inferred_activity)
 
-print("Sequência de Observações (0=Detectado, 1=Não Detectado):\n", observations.T)
+    # Decodificação em lote: várias sequências de tamanhos diferentes em uma única passada
+    gerador = np.random.default_rng(42)
+    sequencias = [observations] + [gerador.integers(0, 2, size=(gerador.integers(1, 30), 1)) for _ in range(999)]
+    observacoes_lote, comprimentos_lote = preencher_sequencias(sequencias)
+    log_probabilidades_lote, estados_lote = viterbi_lote(observacoes_lote, comprimentos_lote,
+                                                         start_probs, trans_matrix, emission_matrix)
+    print("\nViterbi em lote: primeira sequência ->", estados_lote[0, :comprimentos_lote[0]],
+          "log-probabilidade:", log_probabilidades_lote[0])
 
-# aqui prever a sequência de estados ocultos mais provável
-# O metodo predict usa o algoritmo de Viterbi para encontrar a sequência mais provável.
-logprob, hidden_states = model.decode(observations, algorithm="viterbi")
+    # Conferência com o model.decode em algumas sequências do lote
+    iguais = all(
+        np.isclose(model.decode(sequencias[i], algorithm="viterbi")[0], log_probabilidades_lote[i]) and
+        np.array_equal(model.decode(sequencias[i], algorithm="viterbi")[1], estados_lote[i, :comprimentos_lote[i]])
+        for i in range(50))
+    print("Mesmo resultado do model.decode nas 50 primeiras sequências:", iguais)
 
-print("\nLog-probabilidade da sequência observada:", logprob)
-print("Sequência de Estados Ocultos Inferred (0=Andando, 1=Parado):\n", hidden_states)
+    # Decodificação em fluxo: uma observação por vez, com Viterbi confirmado 2 passos depois
+    print("\nDecodificação online (atraso de 2 observações):")
+    decodificador = DecodificadorHMMOnline(start_probs, trans_matrix, emission_matrix, atraso=2)
+    for observacao in observations[:, 0]:
+        probabilidades_filtradas, decisao = decodificador.processar(observacao)
+        texto_decisao = f"confirma t={decisao[0]} como {state_map[decisao[1]]}" if decisao else "aguardando atraso"
+        print(f"t={decodificador.t} obs={observacao} P(Andando)={probabilidades_filtradas[0]:.3f} -> {texto_decisao}")
+    for tempo, estado in decodificador.finalizar():
+        print(f"fim do fluxo: confirma t={tempo} como {state_map[estado]}")
 
-# Traduzir os estados para algo legivel
-state_map = {0: 'Andando', 1: 'Parado'}
-inferred_activity = [state_map[s] for s in hidden_states]
-print("\nAtividade Inferida (mais provável):\n", inferred_activity)
+    # Treinamento: aprende as matrizes a partir de sequências simuladas, em paralelo.
+    sequencias_treino = amostrar_sequencias(20000, 50, start_probs, trans_matrix, emission_matrix, semente=7)
+    start_inicial = np.array([0.5, 0.5])
+    trans_inicial = np.array([[0.6, 0.4], [0.3, 0.7]])
+    emission_inicial = np.array([[0.6, 0.4], [0.2, 0.8]])
+    start_aprendido, trans_aprendida, emission_aprendida, historico = treinar_baum_welch_paralelo(
+        sequencias_treino, start_inicial, trans_inicial, emission_inicial, n_iter=model.n_iter)
+    print(f"\nBaum-Welch paralelo: {len(historico)} iterações, log-verossimilhança "
+          f"{historico[0]:.1f} -> {historico[-1]:.1f}")
+    print("Transições aprendidas:\n", trans_aprendida.round(3))
+    print("Emissões aprendidas:\n", emission_aprendida.round(3))
+    print("Probabilidades iniciais aprendidas:", start_aprendido.round(3))
\ No newline at end of file
@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -5,6 +7,59 @@ import matplotlib.pyplot as plt
 necessario rodar o comando `pip install matplotlib`, caso não tiver instalado essa biblioteca
 """
 
+class BancoFiltrosKalman:
+    """
+    Banco de filtros de Kalman: muitos sensores com o mesmo formato de modelo, avançados
+    juntos. Estados x (sensores, n), covariâncias P (sensores, n, n) e os ruídos Q e R de
+    cada sensor ficam empilhados, e cada passo é um predict/update vetorizado.
+    A, C, Q e R podem ser uma matriz única (vale para todos) ou uma pilha por sensor.
+    """
+    def __init__(self, A, C, Q, R, x_inicial, P_inicial):
+        self.x = np.array(x_inicial, dtype=float) # (sensores, n)
+        numero_sensores, n = self.x.shape
+        self.P = np.array(np.broadcast_to(P_inicial, (numero_sensores, n, n)), dtype=float)
+        self.A = np.broadcast_to(A, (numero_sensores, n, n))
+        m = np.shape(C)[-2]
+        self.C = np.broadcast_to(C, (numero_sensores, m, n))
+        self.Q = np.broadcast_to(Q, (numero_sensores, n, n))
+        self.R = np.broadcast_to(R, (numero_sensores, m, m))
+        self.identidade = np.eye(n)
+
+    def prever(self):
+        """Etapa de tempo para todos os sensores: x = A x, P = A P A^T + Q."""
+        self.x = np.einsum('sij,sj->si', self.A, self.x)
+        self.P = self.A @ self.P @ self.A.transpose(0, 2, 1) + self.Q
+
+    def atualizar(self, medicoes, mascara=None):
+        """
+        Etapa de medição. medicoes: (sensores, m). mascara: (sensores,) com True para quem
+        mediu; sem mascara, medições NaN contam como faltantes. Sensores sem medição ficam
+        só com a previsão. O ganho vem de um solve, sem inverter a matriz de inovação.
+        """
+        medicoes = np.asarray(medicoes, dtype=float).reshape(len(self.x), -1)
+        if mascara is None:
+            mascara = ~np.isnan(medicoes).any(axis=1)
+        indices = np.flatnonzero(mascara)
+        if len(indices) == 0:
+            return
+        x, P, C, R = self.x[indices], self.P[indices], self.C[indices], self.R[indices]
+
+        # Ganho de Kalman: K = P C^T S^-1, com S = C P C^T + R simétrica,
+        # logo K^T = solve(S, C P) (P também é simétrica)
+        CP = C @ P
+        S = CP @ C.transpose(0, 2, 1) + R
+        K = np.linalg.solve(S, CP).transpose(0, 2, 1) # (sensores, n, m)
+
+        inovacao = medicoes[indices] - np.einsum('sij,sj->si', C, x)
+        self.x[indices] = x + np.einsum('sij,sj->si', K, inovacao)
+        self.P[indices] = (self.identidade - K @ C) @ P
+
+    def passo(self, medicoes, mascara=None):
+        """Um passo completo (previsão + medição) para todos os sensores."""
+        self.prever()
+        self.atualizar(medicoes, mascara)
+        return self.x
+
 # Temperatura verdadeira (que não conhecemos diretamente)
 true_temp = 22.5 #  Celsius
 num_steps = 50   # Numero de medições ao longo do tempo
@@ -72,6 +127,28 @@ for k in range(num_steps):
     # Armazenar a estimativa para plotagem
     estimated_temps.append(x_hat_k[0,0])
 
+# Banco de filtros: o mesmo filtro com 1 sensor deve reproduzir o laço acima
+banco_um_sensor = BancoFiltrosKalman(A, C, Q, R, x_inicial=[[20.0]], P_inicial=[[1000.0]])
+estimativas_banco = [banco_um_sensor.passo([[medicao]])[0, 0] for medicao in noisy_measurements]
+print("Banco com 1 sensor igual ao laço:", np.allclose(estimativas_banco, estimated_temps))
+
+# Milhares de salas avançadas juntas, com R diferente por sensor e 10% de leituras faltando
+numero_sensores = 5000
+gerador = np.random.default_rng(0)
+temperaturas_reais = gerador.uniform(18.0, 28.0, size=(numero_sensores, 1))
+R_sensores = gerador.uniform(0.5, 2.0, size=(numero_sensores, 1, 1))
+banco = BancoFiltrosKalman(A, C, Q, R_sensores, x_inicial=np.full((numero_sensores, 1), 20.0),
+                           P_inicial=[[1000.0]])
+inicio_banco = time.perf_counter()
+for k in range(num_steps):
+    temperaturas_reais = temperaturas_reais + gerador.normal(0, np.sqrt(Q[0, 0]), size=(numero_sensores, 1))
+    leituras = temperaturas_reais + gerador.normal(0, 1, size=(numero_sensores, 1)) * np.sqrt(R_sensores[:, 0])
+    banco.passo(leituras, mascara=gerador.random(numero_sensores) > 0.1)
+tempo_banco = time.perf_counter() - inicio_banco
+erro_medio = np.abs(banco.x - temperaturas_reais).mean()
+print(f"Banco com {numero_sensores} sensores: {num_steps} passos em {tempo_banco:.3f}s, "
+      f"erro médio final {erro_medio:.3f} °C")
+
 # Plota os resultados
 plt.figure(figsize=(10, 6))
 plt.plot(true_temps, label='Temperatura Verdadeira', color='green', linestyle='--')
@@ -1,4 +1,7 @@
+import array
 import heapq
+import json
+import random
 
 def heuristica_manhattan(pos_atual, pos_objetivo):
     """Calcula a distância de Manhattan entre duas posições na grade."""
@@ -6,7 +9,7 @@ def heuristica_manhattan(pos_atual, pos_objetivo):
     (x2, y2) = pos_objetivo
     return abs(x1 - x2) + abs(y1 - y2)
 
-def a_estrela_grade_custos(grade_custos, inicio, objetivo, pesos_terreno):
+def a_estrela_grade_custos_simples(grade_custos, inicio, objetivo, pesos_terreno):
     """
     Encontra o caminho de menor custo em uma grade com custos de movimento variáveis usando A*.
 
@@ -20,6 +23,9 @@ def a_estrela_grade_custos(grade_custos, inicio, objetivo, pesos_terreno):
                                Ex: {'G': 1, 'A': 5, 'M': 10, 'S':1, 'E':1}
 
     Retorna um (caminho e o custo total). Se não houver caminho, retorna None, infinito;
+
+    Versão original, que guarda uma cópia do caminho em cada entrada da fronteira.
+    Mantida como referência para comparar com a_estrela_grade_custos.
     """
     linhas = len(grade_custos)
     colunas = len(grade_custos[0])
@@ -64,6 +70,487 @@ def a_estrela_grade_custos(grade_custos, inicio, objetivo, pesos_terreno):
                                                
     return None, float('inf') # Caminho não encontrado
 
+def converter_grade_custos(grade_custos, pesos_terreno):
+    """
+    Converte a grade de letras em uma lista plana de custos, indexada por r*colunas+c.
+    Obstáculos ('#') e terrenos sem peso viram None (célula intransitável).
+    """
+    custos = []
+    for linha in grade_custos:
+        for tipo_terreno in linha:
+            if tipo_terreno == '#':
+                custos.append(None)
+            else:
+                custos.append(pesos_terreno.get(tipo_terreno))
+    return custos
+
+def a_estrela_grade_custos(grade_custos, inicio, objetivo, pesos_terreno, marcos=None, estatisticas=None):
+    """
+    Encontra o caminho de menor custo em uma grade com custos de movimento variáveis usando A*.
+
+    paramentros:
+        grade_custos: Grade representando o terreno com as letras.
+                                     Ex: 'G' para grama, 'A' para água, 'M' para montanha.
+                                     'S' para início, 'E' para fim. '#' para obstáculo.
+        inicio: Coordenadas (linha, coluna) do início.
+        objetivo: Coordenadas (linha, coluna) do objetivo.
+        pesos_terreno (dicionario):  com os custos de movimento para cada tipo de terreno.
+                               Ex: {'G': 1, 'A': 5, 'M': 10, 'S':1, 'E':1}
+        marcos (opcional): MarcosALT pré-calculados para a mesma grade. Se informado, a
+                           heurística passa a ser o maior valor entre Manhattan e o limite ALT.
+        estatisticas (opcional): dicionário que recebe 'nos_expandidos' ao final da busca.
+
+    Retorna um (caminho e o custo total). Se não houver caminho, retorna None, infinito;
+
+    O terreno é convertido uma vez para custos numéricos, g_scores e predecessores ficam
+    em arrays planos, entradas velhas da fronteira são descartadas pelo conjunto fechado
+    e o caminho só é montado no final.
+    """
+    linhas = len(grade_custos)
+    colunas = len(grade_custos[0])
+    total_celulas = linhas * colunas
+    custos = converter_grade_custos(grade_custos, pesos_terreno)
+
+    indice_inicio = inicio[0] * colunas + inicio[1]
+    indice_objetivo = objetivo[0] * colunas + objetivo[1]
+    r_objetivo, c_objetivo = objetivo
+
+    infinito = float('inf')
+    g_scores = [infinito] * total_celulas
+    predecessor = array.array('q', [-1]) * total_celulas
+    fechados = bytearray(total_celulas) # 1 = célula já expandida com o melhor g conhecido
+
+    heuristica_alt = marcos.heuristica_para(indice_objetivo) if marcos is not None else None
+    nos_expandidos = 0
+
+    g_scores[indice_inicio] = 0
+    h_score_inicio = heuristica_manhattan(inicio, objetivo)
+    if heuristica_alt is not None:
+        h_score_inicio = max(h_score_inicio, heuristica_alt(indice_inicio))
+    # Fronteira (fila de prioridade): (f_score, g_score, indice_da_celula)
+    fronteira = [(h_score_inicio, 0, indice_inicio)]
+
+    while fronteira:
+        _, g_score_atual, indice_atual = heapq.heappop(fronteira)
+
+        if fechados[indice_atual]: # Entrada velha: a célula já saiu com um g melhor
+            continue
+        fechados[indice_atual] = 1
+        nos_expandidos += 1
+
+        if indice_atual == indice_objetivo:
+            if estatisticas is not None:
+                estatisticas['nos_expandidos'] = nos_expandidos
+            caminho = []
+            while indice_atual != -1:
+                caminho.append(divmod(indice_atual, colunas))
+                indice_atual = predecessor[indice_atual]
+            caminho.reverse()
+            return caminho, g_score_atual # Caminho encontrado
+
+        r_atual, c_atual = divmod(indice_atual, colunas)
+        # Vizinhos na mesma ordem de a_estrela_grade_custos_simples
+        for r_vizinho, c_vizinho in ((r_atual, c_atual + 1), (r_atual, c_atual - 1),
+                                     (r_atual + 1, c_atual), (r_atual - 1, c_atual)):
+            if 0 <= r_vizinho < linhas and 0 <= c_vizinho < colunas:
+                indice_vizinho = r_vizinho * colunas + c_vizinho
+                custo_movimento_vizinho = custos[indice_vizinho]
+                if custo_movimento_vizinho is None: # Obstáculo
+                    continue
+
+                g_score_tentativo_vizinho = g_score_atual + custo_movimento_vizinho
+                if g_score_tentativo_vizinho < g_scores[indice_vizinho]:
+                    g_scores[indice_vizinho] = g_score_tentativo_vizinho
+                    predecessor[indice_vizinho] = indice_atual
+                    fechados[indice_vizinho] = 0 # Reabre se um caminho melhor aparecer
+                    h_score_vizinho = abs(r_vizinho - r_objetivo) + abs(c_vizinho - c_objetivo)
+                    if heuristica_alt is not None:
+                        h_score_vizinho = max(h_score_vizinho, heuristica_alt(indice_vizinho))
+                    heapq.heappush(fronteira, (g_score_tentativo_vizinho + h_score_vizinho,
+                                               g_score_tentativo_vizinho, indice_vizinho))
+
+    if estatisticas is not None:
+        estatisticas['nos_expandidos'] = nos_expandidos
+    return None, float('inf') # Caminho não encontrado
+
+class AbstracaoHPA:
+    """
+    Camada hierárquica (HPA*) sobre a grade de terreno.
+    A grade é dividida em clusters de tamanho_cluster x tamanho_cluster. Nas bordas entre
+    clusters vizinhos são escolhidas entradas, e os custos entre as entradas de um mesmo
+    cluster são pré-calculados com os pesos_terreno. Cada consulta roda A* nesse grafo
+    pequeno e depois refina cada trecho com uma busca local dentro do cluster.
+
+    O resultado é quase ótimo (não garante o menor custo como a_estrela_grade_custos).
+    A abstração pode ser salva em JSON e carregada depois, sem reconstruir.
+    """
+    # Trechos livres de borda com pelo menos esse tamanho ganham entradas extras nas pontas
+    TAMANHO_MINIMO_DUAS_ENTRADAS = 6
+    # Chaves dos nós temporários da consulta (nunca coincidem com um índice de célula)
+    NO_INICIO = -1
+    NO_OBJETIVO = -2
+
+    def __init__(self, grade_custos, pesos_terreno, tamanho_cluster=10):
+        self.linhas = len(grade_custos)
+        self.colunas = len(grade_custos[0])
+        self.tamanho_cluster = tamanho_cluster
+        self.custos = converter_grade_custos(grade_custos, pesos_terreno)
+        self.arestas = {} # Grafo abstrato: {indice_entrada: {indice_vizinho: custo}}
+        self.construir_entradas()
+        self.construir_arestas_internas()
+
+    def cluster_de(self, indice):
+        r, c = divmod(indice, self.colunas)
+        return r // self.tamanho_cluster, c // self.tamanho_cluster
+
+    def limites_cluster(self, cluster):
+        """Retorna (linha_min, linha_max, coluna_min, coluna_max), com os máximos exclusivos."""
+        cr, cc = cluster
+        r0, c0 = cr * self.tamanho_cluster, cc * self.tamanho_cluster
+        return r0, min(r0 + self.tamanho_cluster, self.linhas), c0, min(c0 + self.tamanho_cluster, self.colunas)
+
+    def adicionar_aresta(self, origem, destino, custo):
+        vizinhos = self.arestas.setdefault(origem, {})
+        if custo < vizinhos.get(destino, float('inf')):
+            vizinhos[destino] = custo
+
+    def construir_entradas(self):
+        """Procura os trechos livres nas bordas entre clusters e liga os dois lados com arestas."""
+        t = self.tamanho_cluster
+        bordas = []
+        # Bordas verticais: pares (célula da esquerda, célula da direita)
+        for c in range(t, self.colunas, t):
+            for r0 in range(0, self.linhas, t):
+                bordas.append([(r * self.colunas + c - 1, r * self.colunas + c)
+                               for r in range(r0, min(r0 + t, self.linhas))])
+        # Bordas horizontais: pares (célula de cima, célula de baixo)
+        for r in range(t, self.linhas, t):
+            for c0 in range(0, self.colunas, t):
+                bordas.append([((r - 1) * self.colunas + c, r * self.colunas + c)
+                               for c in range(c0, min(c0 + t, self.colunas))])
+
+        for borda in bordas:
+            trecho = []
+            for par in borda + [None]: # None fecha o último trecho
+                if par is not None and self.custos[par[0]] is not None and self.custos[par[1]] is not None:
+                    trecho.append(par)
+                    continue
+                if trecho:
+                    # A travessia mais barata do trecho sempre vira entrada; trechos longos
+                    # também ganham as duas pontas
+                    entradas = {min(trecho, key=lambda p: self.custos[p[0]] + self.custos[p[1]])}
+                    if len(trecho) >= self.TAMANHO_MINIMO_DUAS_ENTRADAS:
+                        entradas.update((trecho[0], trecho[-1]))
+                    for lado_a, lado_b in entradas:
+                        # Entrar em uma célula custa o peso do terreno dela
+                        self.adicionar_aresta(lado_a, lado_b, self.custos[lado_b])
+                        self.adicionar_aresta(lado_b, lado_a, self.custos[lado_a])
+                trecho = []
+
+    def construir_arestas_internas(self):
+        """Pré-calcula, com Dijkstra local, o custo entre cada par de entradas do mesmo cluster."""
+        entradas_por_cluster = {}
+        for entrada in list(self.arestas):
+            entradas_por_cluster.setdefault(self.cluster_de(entrada), []).append(entrada)
+
+        for cluster, entradas in entradas_por_cluster.items():
+            limites = self.limites_cluster(cluster)
+            for origem in entradas:
+                distancias, _ = self.dijkstra_local(origem, limites)
+                for destino in entradas:
+                    if destino != origem and destino in distancias:
+                        self.adicionar_aresta(origem, destino, distancias[destino])
+
+    def dijkstra_local(self, origem, limites, alvo=None, reverso=False):
+        """
+        Dijkstra restrito a um retângulo da grade (limites de limites_cluster).
+        Retorna (distancias, predecessor) como dicionários indexados por r*colunas+c.
+        Com reverso=True calcula o custo de cada célula ATÉ a origem, e 'predecessor'
+        aponta para a próxima célula no caminho em direção à origem.
+        """
+        r_min, r_max, c_min, c_max = limites
+        distancias = {origem: 0}
+        predecessor = {origem: -1}
+        fronteira = [(0, origem)]
+        fechados = set()
+
+        while fronteira:
+            distancia_atual, indice_atual = heapq.heappop(fronteira)
+            if indice_atual in fechados:
+                continue
+            fechados.add(indice_atual)
+            if indice_atual == alvo:
+                break
+
+            r_atual, c_atual = divmod(indice_atual, self.colunas)
+            for r_vizinho, c_vizinho in ((r_atual, c_atual + 1), (r_atual, c_atual - 1),
+                                         (r_atual + 1, c_atual), (r_atual - 1, c_atual)):
+                if r_min <= r_vizinho < r_max and c_min <= c_vizinho < c_max:
+                    indice_vizinho = r_vizinho * self.colunas + c_vizinho
+                    if self.custos[indice_vizinho] is None:
+                        continue
+                    # No sentido normal paga-se a célula de chegada; no reverso, a célula atual
+                    custo = self.custos[indice_atual] if reverso else self.custos[indice_vizinho]
+                    nova_distancia = distancia_atual + custo
+                    if nova_distancia < distancias.get(indice_vizinho, float('inf')):
+                        distancias[indice_vizinho] = nova_distancia
+                        predecessor[indice_vizinho] = indice_atual
+                        heapq.heappush(fronteira, (nova_distancia, indice_vizinho))
+
+        return distancias, predecessor
+
+    def buscar(self, inicio, objetivo):
+        """
+        Consulta com o mesmo contrato de a_estrela_grade_custos: retorna (caminho, custo)
+        ou (None, infinito). Início e objetivo são ligados às entradas dos seus clusters,
+        o A* roda no grafo abstrato e cada trecho é refinado na grade.
+        """
+        indice_inicio = inicio[0] * self.colunas + inicio[1]
+        indice_objetivo = objetivo[0] * self.colunas + objetivo[1]
+        if indice_inicio == indice_objetivo:
+            return [inicio], 0
+        if self.custos[indice_objetivo] is None:
+            return None, float('inf')
+
+        cluster_inicio = self.cluster_de(indice_inicio)
+        cluster_objetivo = self.cluster_de(indice_objetivo)
+        dist_inicio, pred_inicio = self.dijkstra_local(indice_inicio, self.limites_cluster(cluster_inicio))
+        dist_objetivo, prox_objetivo = self.dijkstra_local(indice_objetivo, self.limites_cluster(cluster_objetivo),
+                                                           reverso=True)
+
+        # Arestas temporárias: início -> entradas do seu cluster e entradas -> objetivo
+        saidas_inicio = {e: dist_inicio[e] for e in self.arestas if e in dist_inicio}
+        chegadas_objetivo = {e: dist_objetivo[e] for e in self.arestas if e in dist_objetivo}
+
+        melhor_custo = float('inf')
+        melhor_caminho = None
+
+        # Mesmo cluster: o caminho direto dentro do cluster também é candidato
+        if cluster_inicio == cluster_objetivo and indice_objetivo in dist_inicio:
+            melhor_custo = dist_inicio[indice_objetivo]
+            melhor_caminho = self.montar_caminho(pred_inicio, indice_objetivo)
+
+        caminho_abstrato, custo_abstrato = self.a_estrela_abstrato(indice_inicio, indice_objetivo,
+                                                                    saidas_inicio, chegadas_objetivo)
+        if caminho_abstrato is not None and custo_abstrato < melhor_custo:
+            melhor_custo = custo_abstrato
+            melhor_caminho = self.refinar(caminho_abstrato, pred_inicio, prox_objetivo)
+
+        if melhor_caminho is None:
+            # Em casos raros a região do início (ou do objetivo) dentro do cluster não alcança
+            # nenhuma entrada; aí a busca cai para um Dijkstra na grade inteira
+            distancias, predecessor = self.dijkstra_local(indice_inicio, (0, self.linhas, 0, self.colunas),
+                                                          alvo=indice_objetivo)
+            if indice_objetivo not in distancias:
+                return None, float('inf')
+            melhor_custo = distancias[indice_objetivo]
+            melhor_caminho = self.montar_caminho(predecessor, indice_objetivo)
+        return [divmod(indice, self.colunas) for indice in melhor_caminho], melhor_custo
+
+    def a_estrela_abstrato(self, indice_inicio, indice_objetivo, saidas_inicio, chegadas_objetivo):
+        """A* no grafo de entradas. NO_INICIO e NO_OBJETIVO entram só com as arestas temporárias."""
+        r_objetivo, c_objetivo = divmod(indice_objetivo, self.colunas)
+
+        def heuristica(indice):
+            r, c = divmod(indice, self.colunas)
+            return abs(r - r_objetivo) + abs(c - c_objetivo)
+
+        g_scores = {self.NO_INICIO: 0}
+        predecessor = {self.NO_INICIO: None}
+        fronteira = [(heuristica(indice_inicio), 0, self.NO_INICIO)]
+        fechados = set()
+
+        while fronteira:
+            _, g_atual, no_atual = heapq.heappop(fronteira)
+            if no_atual in fechados:
+                continue
+            fechados.add(no_atual)
+
+            if no_atual == self.NO_OBJETIVO:
+                caminho = []
+                while no_atual is not None:
+                    caminho.append(no_atual)
+                    no_atual = predecessor[no_atual]
+                caminho.reverse()
+                return caminho, g_atual
+
+            if no_atual == self.NO_INICIO:
+                vizinhos = saidas_inicio.items()
+            else:
+                vizinhos = list(self.arestas.get(no_atual, {}).items())
+                if no_atual in chegadas_objetivo:
+                    vizinhos.append((self.NO_OBJETIVO, chegadas_objetivo[no_atual]))
+
+            for vizinho, custo in vizinhos:
+                g_tentativo = g_atual + custo
+                if g_tentativo < g_scores.get(vizinho, float('inf')):
+                    g_scores[vizinho] = g_tentativo
+                    predecessor[vizinho] = no_atual
+                    h = 0 if vizinho == self.NO_OBJETIVO else heuristica(vizinho)
+                    heapq.heappush(fronteira, (g_tentativo + h, g_tentativo, vizinho))
+
+        return None, float('inf')
+
+    def montar_caminho(self, predecessor, indice_fim):
+        caminho = []
+        while indice_fim != -1:
+            caminho.append(indice_fim)
+            indice_fim = predecessor[indice_fim]
+        caminho.reverse()
+        return caminho
+
+    def refinar(self, caminho_abstrato, pred_inicio, prox_objetivo):
+        """Transforma a sequência de entradas em um caminho célula a célula."""
+        entradas = caminho_abstrato[1:-1]
+        caminho = self.montar_caminho(pred_inicio, entradas[0])
+
+        for origem, destino in zip(entradas, entradas[1:]):
+            cluster = self.cluster_de(origem)
+            if cluster == self.cluster_de(destino):
+                # Aresta interna: refaz a busca local só dentro do cluster
+                _, predecessor = self.dijkstra_local(origem, self.limites_cluster(cluster), alvo=destino)
+                caminho.extend(self.montar_caminho(predecessor, destino)[1:])
+            else:
+                caminho.append(destino) # Aresta entre clusters: um único passo pela borda
+
+        # Da última entrada até o objetivo, seguindo os ponteiros da busca reversa
+        indice = prox_objetivo[entradas[-1]]
+        while indice != -1:
+            caminho.append(indice)
+            indice = prox_objetivo[indice]
+        return caminho
+
+    def salvar(self, arquivo):
+        """Salva a abstração em JSON para reaproveitar entre execuções."""
+        dados = {
+            'linhas': self.linhas,
+            'colunas': self.colunas,
+            'tamanho_cluster': self.tamanho_cluster,
+            'custos': self.custos,
+            'arestas': {str(origem): [[destino, custo] for destino, custo in vizinhos.items()]
+                        for origem, vizinhos in self.arestas.items()},
+        }
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            json.dump(dados, f)
+
+    @classmethod
+    def carregar(cls, arquivo):
+        """Carrega uma abstração salva com salvar(), sem refazer o pré-processamento."""
+        with open(arquivo, encoding='utf-8') as f:
+            dados = json.load(f)
+        abstracao = cls.__new__(cls)
+        abstracao.linhas = dados['linhas']
+        abstracao.colunas = dados['colunas']
+        abstracao.tamanho_cluster = dados['tamanho_cluster']
+        abstracao.custos = dados['custos']
+        abstracao.arestas = {int(origem): {destino: custo for destino, custo in vizinhos}
+                             for origem, vizinhos in dados['arestas'].items()}
+        return abstracao
+
+def dijkstra_grade(custos, linhas, colunas, origem, reverso=False):
+    """
+    Dijkstra da célula 'origem' (índice plano) para a grade inteira.
+    Retorna a lista de distâncias (infinito onde não alcança). Entrar em uma célula custa
+    o peso dela; com reverso=True a distância é de cada célula ATÉ a origem.
+    """
+    infinito = float('inf')
+    distancias = [infinito] * (linhas * colunas)
+    distancias[origem] = 0
+    fronteira = [(0, origem)]
+
+    while fronteira:
+        distancia_atual, indice_atual = heapq.heappop(fronteira)
+        if distancia_atual > distancias[indice_atual]: # Entrada velha
+            continue
+
+        r_atual, c_atual = divmod(indice_atual, colunas)
+        for r_vizinho, c_vizinho in ((r_atual, c_atual + 1), (r_atual, c_atual - 1),
+                                     (r_atual + 1, c_atual), (r_atual - 1, c_atual)):
+            if 0 <= r_vizinho < linhas and 0 <= c_vizinho < colunas:
+                indice_vizinho = r_vizinho * colunas + c_vizinho
+                if custos[indice_vizinho] is None:
+                    continue
+                custo = custos[indice_atual] if reverso else custos[indice_vizinho]
+                nova_distancia = distancia_atual + custo
+                if nova_distancia < distancias[indice_vizinho]:
+                    distancias[indice_vizinho] = nova_distancia
+                    heapq.heappush(fronteira, (nova_distancia, indice_vizinho))
+
+    return distancias
+
+class MarcosALT:
+    """
+    Heurística ALT (A*, Landmarks, Triangle inequality) para a grade de terreno.
+    Escolhe 'numero_marcos' células bem espalhadas (a próxima é sempre a mais distante
+    das já escolhidas) e guarda as distâncias de Dijkstra de/para cada marco usando os
+    pesos_terreno. Pela desigualdade triangular, para cada marco L:
+        custo(v, t) >= d(L, t) - d(L, v)   e   custo(v, t) >= d(v, L) - d(t, L)
+    O maior desses limites é admissível e, em mapas com muita água e montanha, bem mais
+    justo que a distância de Manhattan.
+    """
+    def __init__(self, grade_custos, pesos_terreno, numero_marcos=4, semente=None):
+        self.linhas = len(grade_custos)
+        self.colunas = len(grade_custos[0])
+        self.custos = converter_grade_custos(grade_custos, pesos_terreno)
+        self.marcos = []
+        # Uma tabela array('d') por marco: 8 bytes por célula, em vez de um objeto float por célula
+        self.distancias_de_marco = [] # d(L, v) para cada célula v
+        self.distancias_ate_marco = [] # d(v, L) para cada célula v
+        self.escolher_marcos(numero_marcos, random.Random(semente))
+
+    def escolher_marcos(self, numero_marcos, gerador):
+        celulas_livres = [i for i, custo in enumerate(self.custos) if custo is not None]
+        if not celulas_livres:
+            return
+
+        # O primeiro marco é a célula mais distante de uma célula livre sorteada
+        referencia = dijkstra_grade(self.custos, self.linhas, self.colunas, gerador.choice(celulas_livres))
+        menor_distancia_aos_marcos = referencia
+
+        for _ in range(numero_marcos):
+            alcancaveis = [i for i in celulas_livres if menor_distancia_aos_marcos[i] != float('inf')]
+            if not alcancaveis:
+                break
+            marco = max(alcancaveis, key=lambda i: menor_distancia_aos_marcos[i])
+            if marco in self.marcos:
+                break # Não há mais células novas para escolher
+            self.marcos.append(marco)
+            distancias_novo_marco = dijkstra_grade(self.custos, self.linhas, self.colunas, marco)
+            self.distancias_de_marco.append(array.array('d', distancias_novo_marco))
+            self.distancias_ate_marco.append(array.array('d', dijkstra_grade(self.custos, self.linhas, self.colunas,
+                                                                             marco, reverso=True)))
+
+            if len(self.marcos) == 1:
+                menor_distancia_aos_marcos = distancias_novo_marco
+            else:
+                menor_distancia_aos_marcos = [min(a, b) for a, b in
+                                              zip(menor_distancia_aos_marcos, distancias_novo_marco)]
+
+    def heuristica_para(self, indice_objetivo):
+        """
+        Retorna uma função h(indice) para o objetivo dado. Os termos que só dependem do
+        objetivo são calculados uma vez aqui; marcos que não alcançam o objetivo são ignorados.
+        """
+        infinito = float('inf')
+        termos_de_marco = [(distancias, distancias[indice_objetivo])
+                           for distancias in self.distancias_de_marco if distancias[indice_objetivo] != infinito]
+        termos_ate_marco = [(distancias, distancias[indice_objetivo])
+                            for distancias in self.distancias_ate_marco if distancias[indice_objetivo] != infinito]
+
+        def heuristica(indice):
+            melhor = 0
+            for distancias, distancia_objetivo in termos_de_marco:
+                limite = distancia_objetivo - distancias[indice]
+                if limite > melhor:
+                    melhor = limite
+            for distancias, distancia_objetivo in termos_ate_marco:
+                limite = distancias[indice] - distancia_objetivo
+                if limite > melhor:
+                    melhor = limite
+            return melhor
+
+        return heuristica
+
 if __name__ == "__main__":
     # 'S' = Início, 'E' = Fim, 'G' = Grama, 'A' = Água, 'M' = Montanha, '#' = Obstáculo
     grade_terreno_exemplo = [
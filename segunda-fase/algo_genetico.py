@@ -1,6 +1,14 @@
+import collections
+import multiprocessing
 import random
 import string
 
+import numpy as np
+
+""""
+necessario rodar o comando `pip install numpy`, caso não tiver instalado essa biblioteca (usada pelo motor "numpy")
+"""
+
 # Parâmetros gerais
 FRASE_ALVO = "algoritmo genetico teste" #pode escolher a frase nessa linha, deixe em string
 CARACTERES_VALIDOS = string.ascii_letters + string.digits + " " + "!.,?" # Inclui espaço e mias alguns símbolos
@@ -10,6 +18,11 @@ TAXA_DE_CROSSOVER = 0.85
 NUMERO_DE_GERACOES = 3000
 TAMANHO_TORNEIO_SELECAO = 3 # Número de indivíduos em cada torneio de seleção
 ELITISMO = True # Se True, o melhor indivíduo da geração anterior é mantido
+MOTOR_AG = "string" # "string" (lista de strings), "numpy" (população como matriz uint8) ou "ilhas"
+NUMERO_DE_ILHAS = 4 # Modelo de ilhas: populações independentes, uma por processo
+INTERVALO_MIGRACAO = 25 # A cada K gerações as ilhas trocam seus melhores indivíduos
+USAR_CACHE_APTIDAO = True # Se True, a aptidão de indivíduos repetidos vem de um cache LRU
+TAMANHO_CACHE_APTIDAO = 10000 # Número máximo de indivíduos guardados no cache
 
 def gerar_individuo(tamanho_frase):
     """Cria um indivíduo (string) aleatório."""
@@ -23,6 +36,47 @@ def calcular_aptidao(individuo, frase_alvo):
             pontuacao += 1
     return pontuacao
 
+class CacheAptidao:
+    """
+    Cache LRU em volta de uma função de aptidão.
+    Indivíduos repetidos (elitismo, pares sem crossover, pouca mutação) não são
+    avaliados de novo. Quando o cache enche, o indivíduo usado há mais tempo sai.
+    """
+    def __init__(self, funcao_aptidao, tamanho_maximo=TAMANHO_CACHE_APTIDAO):
+        self.funcao_aptidao = funcao_aptidao
+        self.tamanho_maximo = tamanho_maximo
+        self.valores = collections.OrderedDict() # {(individuo, frase_alvo): aptidao}
+        self.acertos = 0
+        self.falhas = 0
+
+    def __call__(self, individuo, frase_alvo):
+        chave = (individuo, frase_alvo)
+        if chave in self.valores:
+            self.acertos += 1
+            self.valores.move_to_end(chave) # Marca como usado recentemente
+            return self.valores[chave]
+
+        self.falhas += 1
+        aptidao = self.funcao_aptidao(individuo, frase_alvo)
+        self.valores[chave] = aptidao
+        if len(self.valores) > self.tamanho_maximo:
+            self.valores.popitem(last=False) # Remove o menos usado recentemente
+        return aptidao
+
+    def taxa_de_acerto(self):
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def estatisticas(self):
+        """Retorna os contadores do cache para ver quantas avaliações foram economizadas."""
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_de_acerto': self.taxa_de_acerto(),
+            'tamanho': len(self.valores),
+            'tamanho_maximo': self.tamanho_maximo,
+        }
+
 def selecao_por_torneio(populacao, aptidoes, k_torneio):
     """Seleciona o indivíduo mais apto de um subconjunto aleatório da população."""
     indices_participantes = random.sample(range(len(populacao)), k_torneio)
@@ -54,7 +108,52 @@ def mutar_individuo(individuo, taxa_mutacao, tamanho_frase):
             lista_caracteres_individuo[i] = random.choice(CARACTERES_VALIDOS)
     return "".join(lista_caracteres_individuo)
 
-def executar_algoritmo_genetico(frase_alvo):
+def criar_proxima_geracao(populacao_atual, aptidoes_atuais, melhor_individuo, tamanho_frase):
+    """Gera a próxima população com seleção por torneio, crossover, mutação e elitismo."""
+    proxima_geracao = []
+
+    # Elitismo: se habilitado, o melhor indivíduo passa diretamente
+    if ELITISMO:
+        proxima_geracao.append(melhor_individuo) 
+
+    # 3 Preencher o restante da nova população
+    while len(proxima_geracao) < TAMANHO_POPULACAO:
+        # Seleção de pais
+        pai1 = selecao_por_torneio(populacao_atual, aptidoes_atuais, TAMANHO_TORNEIO_SELECAO)
+        pai2 = selecao_por_torneio(populacao_atual, aptidoes_atuais, TAMANHO_TORNEIO_SELECAO)
+
+        # Crossover
+        if random.random() < TAXA_DE_CROSSOVER:
+            filho1, filho2 = crossover_de_um_ponto(pai1, pai2)
+        else:
+            filho1, filho2 = pai1, pai2 # Pais passam diretamente se não houver crossover
+
+        # Mutação
+        filho1_mutado = mutar_individuo(filho1, TAXA_DE_MUTACAO, tamanho_frase)
+        filho2_mutado = mutar_individuo(filho2, TAXA_DE_MUTACAO, tamanho_frase)
+        
+        proxima_geracao.append(filho1_mutado)
+        if len(proxima_geracao) < TAMANHO_POPULACAO: # Adiciona o segundo filho se houver espaço
+            proxima_geracao.append(filho2_mutado)
+
+    return proxima_geracao
+
+def executar_algoritmo_genetico(frase_alvo, motor=MOTOR_AG, funcao_aptidao=calcular_aptidao, semente=None):
+    """
+    Executa o algoritmo genético com o motor escolhido.
+    funcao_aptidao (só no motor "string"): função (individuo, frase_alvo) -> aptidão,
+    por exemplo calcular_aptidao ou um CacheAptidao em volta dela.
+    semente: torna a execução reproduzível (None usa uma semente aleatória).
+    """
+    if motor == "numpy":
+        return executar_algoritmo_genetico_numpy(frase_alvo, semente)
+    if semente is not None:
+        random.seed(semente) # Os motores "string" e "ilhas" sorteiam com o módulo random
+    if motor == "ilhas":
+        return executar_algoritmo_genetico_ilhas(frase_alvo)
+    if motor != "string":
+        raise ValueError(f"Motor desconhecido: '{motor}'. Use 'string', 'numpy' ou 'ilhas'.")
+
     tamanho_frase = len(frase_alvo)
     
     #1 Inicializar a população com indivíduos aleatórios
@@ -68,7 +167,7 @@ def executar_algoritmo_genetico(frase_alvo):
 
     for geracao_num in range(NUMERO_DE_GERACOES):
         # 2 Calcular a aptidão de cada indivíduo na população
-        aptidoes_atuais = [calcular_aptidao(ind, frase_alvo) for ind in populacao_atual]
+        aptidoes_atuais = [funcao_aptidao(ind, frase_alvo) for ind in populacao_atual]
 
         # Encontrar o melhor indivíduo da geração atual
         maior_aptidao_geracao = -1
@@ -94,43 +193,209 @@ def executar_algoritmo_genetico(frase_alvo):
                   f"Melhor Indivíduo = '{melhor_individuo_global}'")
 
         # Criar a próxima geração
-        proxima_geracao = []
+        proxima_geracao = criar_proxima_geracao(populacao_atual, aptidoes_atuais,
+                                                melhor_individuo_global, tamanho_frase)
+        populacao_atual = proxima_geracao
+        
+    print(f"\n--- Fim do Algoritmo Genético após {geracao_num + 1} gerações ---")
+    return melhor_individuo_global, maior_aptidao_global
+
+def executar_algoritmo_genetico_numpy(frase_alvo, semente=None):
+    """
+    Mesmo algoritmo de executar_algoritmo_genetico, mas com a população guardada
+    como uma matriz uint8 (uma linha por indivíduo, um byte por caractere).
+    Aptidão, seleção por torneio, crossover e mutação são feitos de uma vez
+    para a geração inteira com operações de array.
+    """
+    try:
+        alvo = np.frombuffer(frase_alvo.encode("latin-1"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        raise ValueError("O motor 'numpy' só aceita frases com caracteres de 1 byte (latin-1).")
+
+    rng = np.random.default_rng(semente)
+    alfabeto = np.frombuffer(CARACTERES_VALIDOS.encode("latin-1"), dtype=np.uint8)
+    tamanho_frase = len(frase_alvo)
+    colunas = np.arange(tamanho_frase)
+
+    # Quantos filhos são gerados por geração (a vaga do elite fica reservada)
+    numero_de_filhos = TAMANHO_POPULACAO - 1 if ELITISMO else TAMANHO_POPULACAO
+    numero_de_pares = (numero_de_filhos + 1) // 2
+
+    #1 Inicializar a população com indivíduos aleatórios
+    populacao_atual = rng.choice(alfabeto, size=(TAMANHO_POPULACAO, tamanho_frase))
+
+    melhor_individuo_global = ""
+    maior_aptidao_global = -1
+
+    print(f"Iniciando Algoritmo Genético (motor numpy) para a frase: '{frase_alvo}'")
+    print(f"Tamanho da População: {TAMANHO_POPULACAO}, Gerações: {NUMERO_DE_GERACOES}\n")
+
+    for geracao_num in range(NUMERO_DE_GERACOES):
+        # 2 Aptidão de toda a população: número de posições iguais à frase alvo
+        aptidoes_atuais = (populacao_atual == alvo).sum(axis=1)
+
+        idx_melhor_geracao = int(aptidoes_atuais.argmax())
+        if aptidoes_atuais[idx_melhor_geracao] > maior_aptidao_global:
+            maior_aptidao_global = int(aptidoes_atuais[idx_melhor_geracao])
+            melhor_individuo_global = populacao_atual[idx_melhor_geracao].tobytes().decode("latin-1")
+
+        # Critério de parada: se a frase alvo foi encontrada
+        if maior_aptidao_global == tamanho_frase:
+            print(f"\n--- Solução Perfeita Encontrada na Geração {geracao_num + 1}! ---")
+            break
+
+        # Imprimir progresso a cada X gerações
+        if (geracao_num + 1) % 100 == 0 or geracao_num == 0:
+            print(f"Geração {geracao_num + 1:4d}: Melhor Aptidão = {maior_aptidao_global:2d}/{tamanho_frase}, "
+                  f"Melhor Indivíduo = '{melhor_individuo_global}'")
+
+        # 3 Seleção por torneio de todos os pais de uma vez.
+        # Cada linha sorteia TAMANHO_TORNEIO_SELECAO participantes (com reposição, para custar
+        # O(P·k) por geração; repetições são raras quando o torneio é pequeno perto da população)
+        participantes = rng.integers(0, TAMANHO_POPULACAO, size=(2 * numero_de_pares, TAMANHO_TORNEIO_SELECAO))
+        vencedor_por_linha = aptidoes_atuais[participantes].argmax(axis=1)
+        pais = populacao_atual[participantes[np.arange(len(participantes)), vencedor_por_linha]]
+        pais1, pais2 = pais[:numero_de_pares], pais[numero_de_pares:]
+
+        # Crossover de um ponto: as colunas a partir do ponto de corte são trocadas
+        if tamanho_frase >= 2:
+            fazer_crossover = rng.random(numero_de_pares) < TAXA_DE_CROSSOVER
+            pontos_de_corte = rng.integers(1, tamanho_frase, size=numero_de_pares)
+            trocar = (colunas >= pontos_de_corte[:, None]) & fazer_crossover[:, None]
+            filhos1 = np.where(trocar, pais2, pais1)
+            filhos2 = np.where(trocar, pais1, pais2)
+        else:
+            filhos1, filhos2 = pais1, pais2 # Não pode fazer crossover
+        filhos = np.concatenate((filhos1, filhos2))[:numero_de_filhos]
+
+        # Mutação: sorteia as posições mutadas e um novo caractere para cada uma
+        mascara_mutacao = rng.random(filhos.shape) < TAXA_DE_MUTACAO
+        filhos[mascara_mutacao] = rng.choice(alfabeto, size=int(mascara_mutacao.sum()))
 
         # Elitismo: se habilitado, o melhor indivíduo passa diretamente
         if ELITISMO:
-            proxima_geracao.append(melhor_individuo_global) 
-
-        # 3 Preencher o restante da nova população
-        while len(proxima_geracao) < TAMANHO_POPULACAO:
-            # Seleção de pais
-            pai1 = selecao_por_torneio(populacao_atual, aptidoes_atuais, TAMANHO_TORNEIO_SELECAO)
-            pai2 = selecao_por_torneio(populacao_atual, aptidoes_atuais, TAMANHO_TORNEIO_SELECAO)
-
-            # Crossover
-            if random.random() < TAXA_DE_CROSSOVER:
-                filho1, filho2 = crossover_de_um_ponto(pai1, pai2)
-            else:
-                filho1, filho2 = pai1, pai2 # Pais passam diretamente se não houver crossover
-
-            # Mutação
-            filho1_mutado = mutar_individuo(filho1, TAXA_DE_MUTACAO, tamanho_frase)
-            filho2_mutado = mutar_individuo(filho2, TAXA_DE_MUTACAO, tamanho_frase)
-            
-            proxima_geracao.append(filho1_mutado)
-            if len(proxima_geracao) < TAMANHO_POPULACAO: # Adiciona o segundo filho se houver espaço
-                proxima_geracao.append(filho2_mutado)
-        
-        populacao_atual = proxima_geracao
-        
+            elite = np.frombuffer(melhor_individuo_global.encode("latin-1"), dtype=np.uint8)
+            filhos = np.vstack((elite, filhos))
+
+        populacao_atual = filhos
+
     print(f"\n--- Fim do Algoritmo Genético após {geracao_num + 1} gerações ---")
     return melhor_individuo_global, maior_aptidao_global
 
+# Modelo de ilhas
+# Evento compartilhado entre os processos: é sinalizado quando alguma ilha acha a solução perfeita
+evento_parada_ilhas = None
+
+def inicializar_processo_ilha(evento_parada):
+    """Guarda o evento de parada global no processo trabalhador."""
+    global evento_parada_ilhas
+    evento_parada_ilhas = evento_parada
+
+def evoluir_ilha(parametros_ilha):
+    """
+    Evolui uma ilha por até 'numero_geracoes' gerações usando os mesmos operadores
+    do algoritmo de uma população. Roda dentro de um processo do pool.
+
+    Retorna (populacao, melhor_individuo, maior_aptidao, geracoes_executadas).
+    """
+    populacao_atual, frase_alvo, numero_geracoes, semente = parametros_ilha
+    random.seed(semente) # Cada processo precisa da sua própria sequência aleatória
+    tamanho_frase = len(frase_alvo)
+
+    melhor_individuo = ""
+    maior_aptidao = -1
+    geracoes_executadas = 0
+
+    for _ in range(numero_geracoes):
+        geracoes_executadas += 1
+        aptidoes_atuais = [calcular_aptidao(ind, frase_alvo) for ind in populacao_atual]
+        for i in range(len(populacao_atual)):
+            if aptidoes_atuais[i] > maior_aptidao:
+                maior_aptidao = aptidoes_atuais[i]
+                melhor_individuo = populacao_atual[i]
+
+        if maior_aptidao == tamanho_frase:
+            evento_parada_ilhas.set() # Avisa as outras ilhas para pararem
+            break
+        if evento_parada_ilhas.is_set(): # Outra ilha já encontrou a solução
+            break
+
+        populacao_atual = criar_proxima_geracao(populacao_atual, aptidoes_atuais,
+                                                melhor_individuo, tamanho_frase)
+
+    return populacao_atual, melhor_individuo, maior_aptidao, geracoes_executadas
+
+def migrar_melhores(ilhas, frase_alvo):
+    """
+    Migração em anel: o melhor indivíduo da ilha i substitui o pior da ilha i+1.
+    'ilhas' é a lista das populações e é alterada no lugar.
+    """
+    melhores = []
+    for populacao in ilhas:
+        melhores.append(max(populacao, key=lambda ind: calcular_aptidao(ind, frase_alvo)))
+
+    for i, populacao in enumerate(ilhas):
+        migrante = melhores[i - 1] # A ilha 0 recebe da última ilha
+        idx_pior = min(range(len(populacao)), key=lambda j: calcular_aptidao(populacao[j], frase_alvo))
+        populacao[idx_pior] = migrante
+
+def executar_algoritmo_genetico_ilhas(frase_alvo, numero_de_ilhas=NUMERO_DE_ILHAS,
+                                      intervalo_migracao=INTERVALO_MIGRACAO, processos=None):
+    """
+    Executa NUMERO_DE_ILHAS populações independentes em um pool de processos.
+    Cada ilha evolui 'intervalo_migracao' gerações por rodada; entre as rodadas os
+    melhores indivíduos migram em anel. A busca termina em todas as ilhas assim que
+    uma delas encontra a frase alvo.
+    """
+    tamanho_frase = len(frase_alvo)
+    ilhas = [[gerar_individuo(tamanho_frase) for _ in range(TAMANHO_POPULACAO)]
+             for _ in range(numero_de_ilhas)]
+
+    melhor_individuo_global = ""
+    maior_aptidao_global = -1
+    geracao_num = 0
+
+    print(f"Iniciando Algoritmo Genético (modelo de ilhas) para a frase: '{frase_alvo}'")
+    print(f"Ilhas: {numero_de_ilhas}, População por ilha: {TAMANHO_POPULACAO}, "
+          f"Migração a cada {intervalo_migracao} gerações, Gerações: {NUMERO_DE_GERACOES}\n")
+
+    evento_parada = multiprocessing.Event()
+    with multiprocessing.Pool(processos or numero_de_ilhas, initializer=inicializar_processo_ilha,
+                              initargs=(evento_parada,)) as pool:
+        while geracao_num < NUMERO_DE_GERACOES:
+            geracoes_rodada = min(intervalo_migracao, NUMERO_DE_GERACOES - geracao_num)
+            tarefas = [(populacao, frase_alvo, geracoes_rodada, random.getrandbits(64)) for populacao in ilhas]
+            resultados = pool.map(evoluir_ilha, tarefas)
+
+            ilhas = [populacao for populacao, _, _, _ in resultados]
+            geracao_num += max(geracoes for _, _, _, geracoes in resultados)
+            for _, melhor_ilha, aptidao_ilha, _ in resultados:
+                if aptidao_ilha > maior_aptidao_global:
+                    maior_aptidao_global = aptidao_ilha
+                    melhor_individuo_global = melhor_ilha
+
+            if maior_aptidao_global == tamanho_frase:
+                print(f"\n--- Solução Perfeita Encontrada na Geração {geracao_num}! ---")
+                break
+
+            print(f"Geração {geracao_num:4d}: Melhor Aptidão = {maior_aptidao_global:2d}/{tamanho_frase}, "
+                  f"Melhor Indivíduo = '{melhor_individuo_global}'")
+            migrar_melhores(ilhas, frase_alvo)
+
+    print(f"\n--- Fim do Algoritmo Genético (ilhas) após {geracao_num} gerações por ilha ---")
+    return melhor_individuo_global, maior_aptidao_global
+
 if __name__ == "__main__":
     print("Algoritmo Genético para 'Adivinhar' Frase")
     
-    solucao_final_ag, aptidao_final_ag = executar_algoritmo_genetico(FRASE_ALVO)
+    cache_aptidao = CacheAptidao(calcular_aptidao) if USAR_CACHE_APTIDAO else calcular_aptidao
+    solucao_final_ag, aptidao_final_ag = executar_algoritmo_genetico(FRASE_ALVO, funcao_aptidao=cache_aptidao)
     
     print(f"\nResultado Final:")
     print(f"Melhor Indivíduo Encontrado: '{solucao_final_ag}'")
     print(f"Aptidão do Melhor Indivíduo: {aptidao_final_ag}/{len(FRASE_ALVO)}")
+    if USAR_CACHE_APTIDAO:
+        stats_cache = cache_aptidao.estatisticas()
+        print(f"Cache de aptidão: {stats_cache['acertos']} acertos, {stats_cache['falhas']} avaliações "
+              f"(taxa de acerto {stats_cache['taxa_de_acerto']:.1%})")
     print("-" * 30)
\ No newline at end of file
@@ -0,0 +1,71 @@
+import random
+import time
+
+from a_estrela_terreno import MarcosALT, a_estrela_grade_custos, a_estrela_grade_custos_simples
+
+"""
+Compara o A* original (a_estrela_grade_custos_simples) com a versão de arrays planos
+(a_estrela_grade_custos) em grades de terreno aleatórias, e a heurística de Manhattan
+com a heurística ALT (MarcosALT) em número de nós expandidos.
+Uso: python benchmark_a_estrela.py
+"""
+
+PESOS_TERRENO = {'S': 1, 'E': 1, 'G': 1, 'A': 5, 'M': 10}
+TAMANHOS_GRADE = [100, 300, 1000]
+PROPORCAO_TERRENOS = {'G': 0.6, 'A': 0.2, 'M': 0.12, '#': 0.08}
+# Mapa dominado por água e montanha, onde Manhattan subestima muito o custo
+PROPORCAO_TERRENOS_PESADOS = {'G': 0.1, 'A': 0.45, 'M': 0.4, '#': 0.05}
+TAMANHOS_GRADE_ALT = [100, 300]
+NUMERO_MARCOS = 4
+SEMENTE = 42
+
+def gerar_grade_terreno(tamanho, semente, proporcao_terrenos=PROPORCAO_TERRENOS):
+    """Gera uma grade tamanho x tamanho com 'S' no canto superior esquerdo e 'E' no inferior direito."""
+    gerador = random.Random(semente)
+    tipos = list(proporcao_terrenos)
+    pesos = list(proporcao_terrenos.values())
+    grade = [gerador.choices(tipos, weights=pesos, k=tamanho) for _ in range(tamanho)]
+    grade[0][0] = 'S'
+    grade[tamanho - 1][tamanho - 1] = 'E'
+    return grade, (0, 0), (tamanho - 1, tamanho - 1)
+
+def medir(funcao_a_estrela, grade, inicio, objetivo):
+    """Executa uma busca e retorna (caminho, custo, segundos)."""
+    t0 = time.perf_counter()
+    caminho, custo = funcao_a_estrela(grade, inicio, objetivo, PESOS_TERRENO)
+    return caminho, custo, time.perf_counter() - t0
+
+if __name__ == "__main__":
+    print("Benchmark A*: versão original x versão com arrays planos e conjunto fechado\n")
+    print(f"{'Grade':>11} | {'Original (s)':>12} | {'Novo (s)':>9} | {'Ganho':>6} | Custo")
+    for tamanho in TAMANHOS_GRADE:
+        grade, inicio, objetivo = gerar_grade_terreno(tamanho, SEMENTE)
+        _, custo_original, tempo_original = medir(a_estrela_grade_custos_simples, grade, inicio, objetivo)
+        _, custo_novo, tempo_novo = medir(a_estrela_grade_custos, grade, inicio, objetivo)
+
+        if custo_original != custo_novo:
+            print(f"ATENÇÃO: custos diferentes na grade {tamanho}x{tamanho}: {custo_original} x {custo_novo}")
+        print(f"{tamanho:>5}x{tamanho:<5} | {tempo_original:12.3f} | {tempo_novo:9.3f} | "
+              f"{tempo_original / tempo_novo:5.1f}x | {custo_novo}")
+    print("-" * 30)
+
+    print(f"\nHeurística Manhattan x ALT ({NUMERO_MARCOS} marcos) em mapa de água e montanha\n")
+    print(f"{'Grade':>11} | {'Pré-proc. (s)':>13} | {'Nós Manhattan':>13} | {'Nós ALT':>9} | Custo")
+    for tamanho in TAMANHOS_GRADE_ALT:
+        grade, inicio, objetivo = gerar_grade_terreno(tamanho, SEMENTE, PROPORCAO_TERRENOS_PESADOS)
+        t0 = time.perf_counter()
+        marcos = MarcosALT(grade, PESOS_TERRENO, NUMERO_MARCOS, semente=SEMENTE)
+        tempo_preprocessamento = time.perf_counter() - t0
+
+        estatisticas_manhattan = {}
+        estatisticas_alt = {}
+        _, custo_manhattan = a_estrela_grade_custos(grade, inicio, objetivo, PESOS_TERRENO,
+                                                    estatisticas=estatisticas_manhattan)
+        _, custo_alt = a_estrela_grade_custos(grade, inicio, objetivo, PESOS_TERRENO, marcos=marcos,
+                                              estatisticas=estatisticas_alt)
+
+        if custo_manhattan != custo_alt:
+            print(f"ATENÇÃO: custos diferentes na grade {tamanho}x{tamanho}: {custo_manhattan} x {custo_alt}")
+        print(f"{tamanho:>5}x{tamanho:<5} | {tempo_preprocessamento:13.3f} | "
+              f"{estatisticas_manhattan['nos_expandidos']:13d} | {estatisticas_alt['nos_expandidos']:9d} | {custo_alt}")
+    print("-" * 30)
@@ -1,5 +1,12 @@
+import array
 import collections
 
+import numpy as np
+
+""""
+necessario rodar o comando `pip install numpy`, caso não tiver instalado essa biblioteca (usada por MapaDistancias)
+"""
+
 def bfs_labirinto(labirinto, inicio, fim):
     """
     Encontra o caminho mais curto em um labirinto usando BFS.
@@ -45,6 +52,200 @@ def bfs_labirinto(labirinto, inicio, fim):
                 
     return None # Caminho não encontrado
 
+def reconstruir_caminho(predecessor, indice_fim, colunas):
+    """
+    Refaz o caminho seguindo os predecessores a partir do fim até o início.
+    predecessor: array plano onde predecessor[r*colunas+c] é o índice da célula anterior
+                 (-1 no início da busca).
+    """
+    caminho = []
+    indice = indice_fim
+    while indice != -1:
+        caminho.append(divmod(indice, colunas))
+        indice = predecessor[indice]
+    caminho.reverse()
+    return caminho
+
+def bfs_labirinto_predecessores(labirinto, inicio, fim):
+    """
+    Mesmo BFS de bfs_labirinto, mas sem copiar o caminho parcial em cada entrada da fila.
+    Guarda só um predecessor por célula em um array plano (índice r*colunas+c),
+    marca os visitados em um bytearray e monta o caminho uma única vez ao chegar no fim.
+    Memória O(linhas*colunas) em vez de O(L²) no tamanho do caminho.
+
+    Retorna o mesmo que bfs_labirinto: a lista de coordenadas do caminho ou None.
+    """
+    if inicio == fim:
+        return [inicio]
+
+    linhas, colunas = len(labirinto), len(labirinto[0])
+    total_celulas = linhas * colunas
+    predecessor = array.array('q', [-1]) * total_celulas
+    visitados = bytearray(total_celulas)
+
+    indice_inicio = inicio[0] * colunas + inicio[1]
+    indice_fim = fim[0] * colunas + fim[1]
+    visitados[indice_inicio] = 1
+    fila = collections.deque([indice_inicio])
+
+    while fila:
+        indice_atual = fila.popleft()
+        no_r, no_c = divmod(indice_atual, colunas)
+
+        # Vizinhos na mesma ordem de bfs_labirinto: direita, esquerda, baixo, cima
+        for vizinho_r, vizinho_c in ((no_r, no_c + 1), (no_r, no_c - 1), (no_r + 1, no_c), (no_r - 1, no_c)):
+            if 0 <= vizinho_r < linhas and 0 <= vizinho_c < colunas:
+                indice_vizinho = vizinho_r * colunas + vizinho_c
+                if not visitados[indice_vizinho] and labirinto[vizinho_r][vizinho_c] != '#':
+                    predecessor[indice_vizinho] = indice_atual
+                    if indice_vizinho == indice_fim:
+                        return reconstruir_caminho(predecessor, indice_fim, colunas) # Caminho encontrado
+                    visitados[indice_vizinho] = 1
+                    fila.append(indice_vizinho)
+
+    return None # Caminho não encontrado
+
+def bfs_labirinto_bidirecional(labirinto, inicio, fim):
+    """
+    BFS bidirecional para uma única consulta inicio -> fim.
+    Busca a partir das duas pontas ao mesmo tempo, sempre expandindo a camada inteira
+    da fronteira menor, e para quando as duas buscas se encontram. O caminho continua
+    sendo o mais curto, mas em mapas abertos expande bem menos células.
+
+    Retorna o mesmo que bfs_labirinto: a lista de coordenadas do caminho ou None.
+    """
+    if inicio == fim:
+        return [inicio]
+
+    linhas, colunas = len(labirinto), len(labirinto[0])
+    if labirinto[fim[0]][fim[1]] == '#':
+        return None # O fim é uma parede, nunca seria alcançado
+
+    total_celulas = linhas * colunas
+    indice_inicio = inicio[0] * colunas + inicio[1]
+    indice_fim = fim[0] * colunas + fim[1]
+
+    # Um lado para cada ponta: distância (-1 = não visitado) e predecessor por célula
+    distancia = [array.array('q', [-1]) * total_celulas, array.array('q', [-1]) * total_celulas]
+    predecessor = [array.array('q', [-1]) * total_celulas, array.array('q', [-1]) * total_celulas]
+    distancia[0][indice_inicio] = 0
+    distancia[1][indice_fim] = 0
+    fronteiras = [[indice_inicio], [indice_fim]]
+
+    while fronteiras[0] and fronteiras[1]:
+        # Expande o lado com a fronteira menor
+        lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+        dist_lado, dist_outro = distancia[lado], distancia[1 - lado]
+        pred_lado = predecessor[lado]
+
+        proxima_fronteira = []
+        melhor_encontro = None # (tamanho_total, celula_deste_lado, celula_do_outro_lado)
+
+        for indice_atual in fronteiras[lado]:
+            no_r, no_c = divmod(indice_atual, colunas)
+            for vizinho_r, vizinho_c in ((no_r, no_c + 1), (no_r, no_c - 1), (no_r + 1, no_c), (no_r - 1, no_c)):
+                if not (0 <= vizinho_r < linhas and 0 <= vizinho_c < colunas):
+                    continue
+                indice_vizinho = vizinho_r * colunas + vizinho_c
+                if labirinto[vizinho_r][vizinho_c] == '#' and indice_vizinho != indice_inicio:
+                    continue
+
+                # As duas buscas se encontraram: guarda o encontro mais curto desta camada
+                if dist_outro[indice_vizinho] != -1:
+                    tamanho = dist_lado[indice_atual] + 1 + dist_outro[indice_vizinho]
+                    if melhor_encontro is None or tamanho < melhor_encontro[0]:
+                        melhor_encontro = (tamanho, indice_atual, indice_vizinho)
+                    continue
+
+                if dist_lado[indice_vizinho] == -1:
+                    dist_lado[indice_vizinho] = dist_lado[indice_atual] + 1
+                    pred_lado[indice_vizinho] = indice_atual
+                    proxima_fronteira.append(indice_vizinho)
+
+        if melhor_encontro is not None:
+            # Termina a camada inteira antes de parar, para garantir o menor caminho
+            _, celula_lado, celula_outro = melhor_encontro
+            if lado == 0:
+                celula_inicio_lado, celula_fim_lado = celula_lado, celula_outro
+            else:
+                celula_inicio_lado, celula_fim_lado = celula_outro, celula_lado
+            caminho = reconstruir_caminho(predecessor[0], celula_inicio_lado, colunas)
+            metade_fim = reconstruir_caminho(predecessor[1], celula_fim_lado, colunas)
+            metade_fim.reverse()
+            return caminho + metade_fim
+
+        fronteiras[lado] = proxima_fronteira
+
+    return None # Caminho não encontrado
+
+class MapaDistancias:
+    """
+    Distâncias BFS de uma origem para TODAS as células do labirinto, calculadas uma vez.
+    O labirinto vira uma máscara booleana de paredes (uma única conversão) e a BFS avança
+    uma camada inteira por vez deslocando os índices da fronteira com NumPy (frente de onda).
+    Depois disso, o caminho mais curto até qualquer célula sai direto do mapa, sem refazer a busca.
+    """
+    def __init__(self, labirinto, inicio):
+        self.inicio = inicio
+        self.paredes = np.array([list(linha) for linha in labirinto]) == '#'
+        self.distancias = self.calcular_distancias()
+
+    def calcular_distancias(self):
+        """Retorna um array int com a distância de cada célula ao início (-1 = inalcançável)."""
+        linhas, colunas = self.paredes.shape
+        livres = ~self.paredes.ravel()
+        distancias = np.full(linhas * colunas, -1, dtype=np.int64)
+
+        # A fronteira é o vetor de índices planos (r*colunas+c) da camada atual
+        fronteira = np.array([self.inicio[0] * colunas + self.inicio[1]])
+        distancias[fronteira] = 0
+        distancia_atual = 0
+
+        while fronteira.size:
+            distancia_atual += 1
+            # Vizinhos da camada inteira: desloca os índices para direita, esquerda, baixo e cima
+            coluna = fronteira % colunas
+            vizinhos = np.concatenate((
+                fronteira[coluna < colunas - 1] + 1,
+                fronteira[coluna > 0] - 1,
+                fronteira + colunas,
+                fronteira - colunas,
+            ))
+            vizinhos = vizinhos[(vizinhos >= 0) & (vizinhos < distancias.size)]
+            vizinhos = np.unique(vizinhos[livres[vizinhos] & (distancias[vizinhos] < 0)])
+
+            distancias[vizinhos] = distancia_atual
+            fronteira = vizinhos
+
+        return distancias.reshape(linhas, colunas)
+
+    def distancia(self, celula):
+        """Número de passos do início até a célula, ou None se ela não for alcançável."""
+        d = int(self.distancias[celula])
+        return d if d >= 0 else None
+
+    def caminho_ate(self, destino):
+        """
+        Caminho mais curto do início até 'destino', no mesmo formato de bfs_labirinto.
+        Anda do destino para trás sempre para um vizinho com distância uma unidade menor.
+        """
+        if self.distancias[destino] < 0:
+            return None # Caminho não encontrado
+
+        linhas, colunas = self.distancias.shape
+        caminho = [destino]
+        no_r, no_c = destino
+        while (no_r, no_c) != self.inicio:
+            distancia_anterior = self.distancias[no_r, no_c] - 1
+            for vizinho_r, vizinho_c in ((no_r, no_c + 1), (no_r, no_c - 1), (no_r + 1, no_c), (no_r - 1, no_c)):
+                if 0 <= vizinho_r < linhas and 0 <= vizinho_c < colunas and \
+                   self.distancias[vizinho_r, vizinho_c] == distancia_anterior:
+                    no_r, no_c = vizinho_r, vizinho_c
+                    break
+            caminho.append((no_r, no_c))
+        caminho.reverse()
+        return caminho
+
 if __name__ == "__main__":
     labirinto_exemplo = [
         ['S', ' ', '#', ' ', ' '],
@@ -1,9 +1,26 @@
+import concurrent.futures
 import random
+import time
+
+import numpy as np
+
+""""
+necessario rodar o comando `pip install numpy`, caso não tiver instalado essa biblioteca (usada no modo com vários pontos de partida)
+"""
 
 def funcao_objetivo_parabola(x):
     """Função a ser maximizada: -(x-7)^2 + 20. Máximo em x=7, f(x)=20."""
     return -((x - 7)**2) + 20
 
+def funcao_objetivo_multimodal(x):
+    """Função com vários máximos locais no domínio [0, 15]; o global fica perto de x=13.37, f(x)=16.93.
+    Aceita um float ou um array NumPy."""
+    return 5 * np.sin(2 * x) + x - 0.05 * (x - 8) ** 2
+
+def funcao_objetivo_paraboloide(x):
+    """Função de N variáveis a ser maximizada: 20 - soma((x_i - 7)^2). Máximo em x_i=7, f(x)=20."""
+    return 20 - sum((xi - 7) ** 2 for xi in x)
+
 def hill_climbing_simples(func_objetivo, x_inicial, passo, max_iteracoes, dominio_min, dominio_max):
     """
     Encontra o máximo de uma função usando Hill Climbing.
@@ -53,6 +70,154 @@ def hill_climbing_simples(func_objetivo, x_inicial, passo, max_iteracoes, domini
             
     return x_atual, valor_atual
 
+def hill_climbing_multiplos_inicios(func_objetivo, numero_inicios, passo, max_iteracoes,
+                                    dominio_min, dominio_max, semente=None):
+    """
+    Hill Climbing com vários pontos de partida avançando juntos em um array NumPy.
+
+    A cada iteração os vizinhos da esquerda e da direita de todos os pontos ainda ativos
+    são avaliados em UMA chamada de func_objetivo (que precisa aceitar arrays). Cada ponto
+    segue a mesma regra de hill_climbing_simples e é congelado quando não melhora mais.
+
+    paramentros:
+        func_objetivo: A função a ser maximizada (vetorizada, recebe e retorna arrays).
+        numero_inicios: Quantos pontos de partida aleatórios usar.
+        passo, max_iteracoes, dominio_min, dominio_max: como em hill_climbing_simples.
+        semente: Semente do gerador aleatório (opcional).
+
+    Returns:
+        tuple: (melhor_x_encontrado, melhor_valor_funcao_encontrado) entre todos os máximos locais
+    """
+    rng = np.random.default_rng(semente)
+    x_atual = rng.uniform(dominio_min, dominio_max, numero_inicios)
+    valor_atual = np.asarray(func_objetivo(x_atual), dtype=float)
+    ativos = np.ones(numero_inicios, dtype=bool)
+
+    for i in range(max_iteracoes):
+        idx_ativos = np.flatnonzero(ativos)
+        if idx_ativos.size == 0:
+            break # Todos os pontos chegaram a um máximo local
+
+        x_ativos = x_atual[idx_ativos]
+        x_vizinho_esq = np.maximum(dominio_min, x_ativos - passo)
+        x_vizinho_dir = np.minimum(dominio_max, x_ativos + passo)
+
+        # Uma única chamada avalia os dois vizinhos de todos os pontos ativos
+        valores_vizinhos = np.asarray(func_objetivo(np.concatenate((x_vizinho_esq, x_vizinho_dir))), dtype=float)
+        valor_vizinho_esq = valores_vizinhos[:idx_ativos.size]
+        valor_vizinho_dir = valores_vizinhos[idx_ativos.size:]
+
+        melhor_vizinho_x = x_ativos.copy()
+        melhor_vizinho_valor = valor_atual[idx_ativos]
+        #trocas
+        troca_esq = valor_vizinho_esq > melhor_vizinho_valor
+        melhor_vizinho_x[troca_esq] = x_vizinho_esq[troca_esq]
+        melhor_vizinho_valor = np.where(troca_esq, valor_vizinho_esq, melhor_vizinho_valor)
+
+        troca_dir = valor_vizinho_dir > melhor_vizinho_valor
+        melhor_vizinho_x[troca_dir] = x_vizinho_dir[troca_dir]
+        melhor_vizinho_valor = np.where(troca_dir, valor_vizinho_dir, melhor_vizinho_valor)
+
+        melhorou = melhor_vizinho_valor > valor_atual[idx_ativos]
+        x_atual[idx_ativos] = melhor_vizinho_x
+        valor_atual[idx_ativos] = melhor_vizinho_valor
+        ativos[idx_ativos[~melhorou]] = False # Congela quem atingiu máximo local (ou platô)
+
+    idx_melhor = int(valor_atual.argmax())
+    return float(x_atual[idx_melhor]), float(valor_atual[idx_melhor])
+
+def hill_climbing_n_dimensoes(func_objetivo, x_inicial, passo, limites, max_avaliacoes,
+                              passo_minimo=1e-6, fator_reducao=0.5, vizinhos_amostrados=None,
+                              max_trabalhadores=None, usar_processos=False, semente=None):
+    """
+    Hill Climbing em um domínio N-dimensional (caixa), para funções objetivo caras.
+
+    A cada passo gera os 2N vizinhos nos eixos (x ± passo em cada dimensão) ou, se
+    'vizinhos_amostrados' for informado, esse número de vizinhos sorteados na caixa
+    [x - passo, x + passo]. Os vizinhos são avaliados ao mesmo tempo em um pool de
+    threads (ou de processos, com usar_processos=True; aí func_objetivo precisa ser uma
+    função de módulo). Quando nenhum vizinho melhora, o passo é reduzido por
+    'fator_reducao' em vez de parar; a busca para quando o passo fica menor que
+    'passo_minimo' ou quando o orçamento 'max_avaliacoes' acaba.
+
+    paramentros:
+        func_objetivo: A função a ser maximizada, recebe uma tupla com N valores.
+        x_inicial: Ponto de partida (sequência de N floats).
+        passo: Tamanho inicial do passo.
+        limites: Lista de (minimo, maximo) para cada dimensão.
+        max_avaliacoes: Limite rígido de chamadas a func_objetivo (inclui o ponto inicial).
+
+    Returns:
+        tuple: (melhor_x_encontrado, melhor_valor_funcao_encontrado, estatisticas)
+    """
+    if max_avaliacoes < 1:
+        raise ValueError("max_avaliacoes precisa ser pelo menos 1.")
+
+    gerador = random.Random(semente)
+    inicio_execucao = time.perf_counter()
+    estatisticas = {'avaliacoes': 0, 'iteracoes': 0, 'movimentos': 0, 'reducoes_passo': 0,
+                    'passo_final': passo, 'motivo_parada': '', 'tempo_segundos': 0.0}
+
+    def limitar(valor, dimensao):
+        minimo, maximo = limites[dimensao]
+        return min(maximo, max(minimo, valor))
+
+    def gerar_vizinhos(x, passo_atual):
+        if vizinhos_amostrados is None:
+            vizinhos = []
+            for d in range(len(x)):
+                for sinal in (-1, 1):
+                    vizinho = list(x)
+                    vizinho[d] = limitar(x[d] + sinal * passo_atual, d)
+                    vizinhos.append(tuple(vizinho))
+        else:
+            vizinhos = [tuple(limitar(x[d] + gerador.uniform(-passo_atual, passo_atual), d) for d in range(len(x)))
+                        for _ in range(vizinhos_amostrados)]
+        # Vizinhos presos na borda podem repetir o ponto atual: não gastam orçamento
+        return list(dict.fromkeys(v for v in vizinhos if v != x))
+
+    x_atual = tuple(limitar(valor, d) for d, valor in enumerate(x_inicial))
+    valor_atual = func_objetivo(x_atual)
+    estatisticas['avaliacoes'] = 1
+    passo_atual = passo
+
+    tipo_executor = concurrent.futures.ProcessPoolExecutor if usar_processos else concurrent.futures.ThreadPoolExecutor
+    with tipo_executor(max_workers=max_trabalhadores) as executor:
+        while True:
+            # O orçamento vem primeiro: se as duas condições valem, quem parou a busca foi ele
+            orcamento_restante = max_avaliacoes - estatisticas['avaliacoes']
+            if orcamento_restante <= 0:
+                estatisticas['motivo_parada'] = 'orçamento de avaliações'
+                break
+            if passo_atual < passo_minimo:
+                estatisticas['motivo_parada'] = 'passo mínimo'
+                break
+
+            vizinhos = gerar_vizinhos(x_atual, passo_atual)[:orcamento_restante]
+            estatisticas['iteracoes'] += 1
+            valores_vizinhos = list(executor.map(func_objetivo, vizinhos))
+            estatisticas['avaliacoes'] += len(vizinhos)
+
+            melhor_vizinho_x = x_atual
+            melhor_vizinho_valor = valor_atual
+            for vizinho, valor in zip(vizinhos, valores_vizinhos):
+                if valor > melhor_vizinho_valor:
+                    melhor_vizinho_x = vizinho
+                    melhor_vizinho_valor = valor
+
+            if melhor_vizinho_valor > valor_atual:
+                x_atual = melhor_vizinho_x
+                valor_atual = melhor_vizinho_valor
+                estatisticas['movimentos'] += 1
+            else:
+                # Platô ou máximo local na escala atual: tenta passos menores
+                passo_atual *= fator_reducao
+                estatisticas['reducoes_passo'] += 1
+
+    estatisticas['passo_final'] = passo_atual
+    estatisticas['tempo_segundos'] = time.perf_counter() - inicio_execucao
+    return list(x_atual), valor_atual, estatisticas
+
 if __name__ == "__main__":
     # Parâmetros para o Hill Climbing
     x_partida = random.uniform(0, 15) # Ponto de partida aleatório no domínio [0, 15]
@@ -76,4 +241,35 @@ if __name__ == "__main__":
     print(f"\nApós Hill Climbing:")
     print(f"Máximo encontrado em x = {melhor_x_encontrado:.4f}")
     print(f"Valor da função no máximo encontrado f(x) = {max_valor_encontrado:.4f}")
+    print("-" * 30)
+
+    # Função com vários máximos locais: vários pontos de partida de uma vez
+    numero_pontos_partida = 1000
+    print(f"\nHill Climbing com {numero_pontos_partida} pontos de partida na função multimodal")
+    melhor_x_multi, max_valor_multi = hill_climbing_multiplos_inicios(
+        funcao_objetivo_multimodal,
+        numero_pontos_partida,
+        tamanho_passo,
+        num_iteracoes,
+        limite_inferior_dominio,
+        limite_superior_dominio
+    )
+    print(f"Melhor máximo encontrado em x = {melhor_x_multi:.4f}")
+    print(f"Valor da função f(x) = {max_valor_multi:.4f}")
+    print("-" * 30)
+
+    # Domínio N-dimensional com avaliação dos vizinhos em paralelo e orçamento de avaliações
+    numero_dimensoes = 5
+    print(f"\nHill Climbing em {numero_dimensoes} dimensões, f(x) = 20 - soma((x_i - 7)^2)")
+    melhor_x_nd, max_valor_nd, stats_nd = hill_climbing_n_dimensoes(
+        funcao_objetivo_paraboloide,
+        [random.uniform(0, 15) for _ in range(numero_dimensoes)],
+        1.0,
+        [(limite_inferior_dominio, limite_superior_dominio)] * numero_dimensoes,
+        max_avaliacoes=2000
+    )
+    print(f"Máximo encontrado em x = {[round(xi, 4) for xi in melhor_x_nd]}")
+    print(f"Valor da função f(x) = {max_valor_nd:.4f}")
+    print(f"Avaliações: {stats_nd['avaliacoes']}, Iterações: {stats_nd['iteracoes']}, "
+          f"Reduções de passo: {stats_nd['reducoes_passo']}, Parada: {stats_nd['motivo_parada']}")
     print("-" * 30)
\ No newline at end of file
@@ -0,0 +1,260 @@
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import platform
+import random
+import sys
+import time
+
+try:
+    import resource # Pico de memória do processo; só existe em sistemas Unix
+except ImportError:
+    resource = None
+
+from planej_reforma_csp import ReformaCSP, backtracking_search_csp
+
+"""
+Benchmark de escala do ReformaCSP: gera DAGs de precedência aleatórios (com semente)
+de 10 a 10.000 tarefas, com durações e prazos de folga variados, roda
+backtracking_search_csp em cada um e grava nós explorados, nós/segundo, pico de memória
+e tempo em JSON, para comparar o solver antes e depois de uma mudança.
+Uso: python benchmark_reforma_csp.py [--saida resultados.json]
+     python benchmark_reforma_csp.py --backjumping --saida cbj.json
+     (com e sem --backjumping, depois --comparar, para medir o ganho do backjumping;
+     em instâncias que a busca simples resolve, por exemplo:
+     --tamanhos --tamanhos-recursos 10 12 --profissionais 2 --folgas 0
+     --sementes 1 2 3 4 5 --limite-nos 200000)
+     python benchmark_reforma_csp.py --comparar antes.json depois.json
+"""
+
+TAMANHOS_SEM_RECURSOS = [10, 100, 1000, 10000]
+# Com a restrição de profissionais a busca é bem mais cara por nó
+TAMANHOS_COM_RECURSOS = [10, 100, 300, 1000]
+# Prazo = limite inferior * (1 + folga); folga 0 é o prazo mais apertado possível
+FOLGAS_PRAZO = [0.0, 0.1, 0.5]
+PROFISSIONAIS_BENCHMARK = 4
+DURACAO_MINIMA = 1
+DURACAO_MAXIMA = 10
+MAX_PREDECESSORAS = 3
+JANELA_PREDECESSORAS = 50 # As predecessoras são sorteadas entre as N tarefas anteriores
+LIMITE_NOS = 20000 # Limite determinístico: o mesmo em todas as execuções comparadas
+SEMENTE = 42
+ARQUIVO_SAIDA = "benchmark_reforma_csp.json"
+
+def gerar_instancia(numero_tarefas, semente, folga=0.1, profissionais=None):
+    """
+    Gera um DAG de precedências aleatório: a tarefa i só depende de tarefas anteriores
+    (dentro de JANELA_PREDECESSORAS), então não há ciclos. O prazo é o limite inferior
+    (caminho crítico e, com profissionais, trabalho total / equipe) vezes (1 + folga).
+    Retorna um dicionário com os argumentos do ReformaCSP.
+    """
+    gerador = random.Random(semente)
+    tarefas = [f"T{i}" for i in range(numero_tarefas)]
+    duracoes = {tarefa: gerador.randint(DURACAO_MINIMA, DURACAO_MAXIMA) for tarefa in tarefas}
+    precedencias = {}
+    for i in range(1, numero_tarefas):
+        candidatas = range(max(0, i - JANELA_PREDECESSORAS), i)
+        quantidade = gerador.randint(0, min(MAX_PREDECESSORAS, len(candidatas)))
+        if quantidade:
+            precedencias[tarefas[i]] = [tarefas[j] for j in gerador.sample(candidatas, quantidade)]
+
+    demanda = None
+    if profissionais is not None:
+        demanda = {tarefa: gerador.randint(1, min(2, profissionais)) for tarefa in tarefas}
+
+    # Caminho crítico: as tarefas já estão em ordem topológica
+    inicio_mais_cedo = {}
+    for tarefa in tarefas:
+        inicio_mais_cedo[tarefa] = max((inicio_mais_cedo[antecessora] + duracoes[antecessora]
+                                        for antecessora in precedencias.get(tarefa, [])), default=0)
+    limite_inferior = max((inicio_mais_cedo[tarefa] + duracoes[tarefa] for tarefa in tarefas), default=0)
+    if profissionais is not None:
+        trabalho_total = sum(duracoes[tarefa] * demanda[tarefa] for tarefa in tarefas)
+        limite_inferior = max(limite_inferior, math.ceil(trabalho_total / profissionais))
+
+    return {
+        'tarefas': tarefas,
+        'duracoes': duracoes,
+        'precedencias': precedencias,
+        'prazo_maximo_dias': math.ceil(limite_inferior * (1 + folga)),
+        'profissionais_disponiveis': profissionais,
+        'demanda_profissionais': demanda,
+    }
+
+def validar_cronograma(instancia, cronograma):
+    """Confere prazo, precedências e equipe de um cronograma {tarefa: (inicio, fim)}."""
+    if set(cronograma) != set(instancia['tarefas']):
+        return False
+    for tarefa, (inicio, fim) in cronograma.items():
+        if inicio < 0 or fim != inicio + instancia['duracoes'][tarefa] or fim > instancia['prazo_maximo_dias']:
+            return False
+        if any(cronograma[antecessora][1] > inicio for antecessora in instancia['precedencias'].get(tarefa, [])):
+            return False
+    if instancia['profissionais_disponiveis'] is not None:
+        uso_por_dia = [0] * instancia['prazo_maximo_dias']
+        for tarefa, (inicio, fim) in cronograma.items():
+            for dia in range(inicio, fim):
+                uso_por_dia[dia] += instancia['demanda_profissionais'][tarefa]
+        if max(uso_por_dia, default=0) > instancia['profissionais_disponiveis']:
+            return False
+    return True
+
+def resolver_instancia(instancia, limite_nos, backjumping=False):
+    """Monta o CSP e busca; retorna (csp, cronograma, segundos_construcao, segundos_busca)."""
+    t0 = time.perf_counter()
+    csp = ReformaCSP(instancia['tarefas'], instancia['duracoes'], instancia['precedencias'],
+                     instancia['prazo_maximo_dias'], instancia['profissionais_disponiveis'],
+                     instancia['demanda_profissionais'])
+    t1 = time.perf_counter()
+    cronograma = backtracking_search_csp(csp, backjumping=backjumping, limite_nos=limite_nos)
+    return csp, cronograma, t1 - t0, time.perf_counter() - t1
+
+def pico_memoria_processo():
+    """Maior uso de memória residente (bytes) do processo atual até agora, ou None."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024 # Linux informa em KB
+
+def medir_instancia(instancia, limite_nos=LIMITE_NOS, backjumping=False):
+    """
+    Resolve uma instância e retorna as medidas. Feita para rodar em um processo novo
+    (executar_benchmark cuida disso): o pico de memória é o do processo inteiro, e a
+    memória base é o pico antes de montar o CSP (interpretador + instância).
+    """
+    # O backtracking é recursivo: uma chamada por tarefa atribuída
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 2 * len(instancia['tarefas']) + 1000))
+
+    memoria_base = pico_memoria_processo()
+    csp, cronograma, tempo_construcao, tempo_busca = resolver_instancia(instancia, limite_nos, backjumping)
+    estatisticas = csp.estatisticas_busca
+    if not csp.viavel:
+        resultado = 'inviavel_caminho_critico'
+    elif cronograma is not None:
+        resultado = 'solucao'
+    elif estatisticas['busca_interrompida']:
+        resultado = 'interrompida'
+    else:
+        resultado = 'sem_solucao'
+
+    return {
+        'numero_tarefas': len(instancia['tarefas']),
+        'prazo_maximo_dias': instancia['prazo_maximo_dias'],
+        'profissionais_disponiveis': instancia['profissionais_disponiveis'],
+        'resultado': resultado,
+        'cronograma_valido': validar_cronograma(instancia, cronograma) if cronograma is not None else None,
+        'nos_explorados': estatisticas['nos_explorados'],
+        'nos_por_segundo': estatisticas['nos_explorados'] / tempo_busca if tempo_busca > 0 else None,
+        'pico_memoria_bytes': pico_memoria_processo(),
+        'memoria_base_bytes': memoria_base,
+        'tempo_construcao_segundos': tempo_construcao,
+        'tempo_busca_segundos': tempo_busca,
+    }
+
+def executar_benchmark(tamanhos_sem_recursos=TAMANHOS_SEM_RECURSOS, tamanhos_com_recursos=TAMANHOS_COM_RECURSOS,
+                       folgas=FOLGAS_PRAZO, sementes=(SEMENTE,), limite_nos=LIMITE_NOS, backjumping=False,
+                       profissionais_equipe=PROFISSIONAIS_BENCHMARK):
+    """
+    Roda a grade tamanhos x folgas x sementes (sem e com equipe de 'profissionais_equipe')
+    e retorna o relatório.
+    Cada instância roda em um processo novo ('spawn'), para que o pico de memória de uma
+    não contamine a medida da seguinte. Com backjumping=True a busca usa CBJ com nogoods.
+    """
+    contexto = multiprocessing.get_context("spawn")
+    configuracoes = [(tamanho, None) for tamanho in tamanhos_sem_recursos] + \
+                    [(tamanho, profissionais_equipe) for tamanho in tamanhos_com_recursos]
+    resultados = []
+
+    print(f"{'Tarefas':>7} | {'Equipe':>6} | {'Folga':>5} | {'Semente':>7} | {'Resultado':>24} | {'Nós':>6} | "
+          f"{'Nós/s':>8} | {'Memória (MB)':>12} | Tempo (s)")
+    for tamanho, profissionais in configuracoes:
+        for folga, semente in itertools.product(folgas, sementes):
+            instancia = gerar_instancia(tamanho, semente, folga, profissionais)
+            with contexto.Pool(1) as pool:
+                medida = pool.apply(medir_instancia, (instancia, limite_nos, backjumping))
+            medida.update({'semente': semente, 'folga': folga})
+            resultados.append(medida)
+
+            nos_por_segundo = f"{medida['nos_por_segundo']:8.0f}" if medida['nos_por_segundo'] else f"{'-':>8}"
+            memoria = f"{(medida['pico_memoria_bytes'] - medida['memoria_base_bytes']) / 2**20:12.1f}" \
+                      if medida['pico_memoria_bytes'] is not None else f"{'-':>12}"
+            print(f"{tamanho:7d} | {profissionais or '-':>6} | {folga:5.2f} | {semente:7d} | {medida['resultado']:>24} | "
+                  f"{medida['nos_explorados']:6d} | {nos_por_segundo} | {memoria} | {medida['tempo_busca_segundos']:.3f}")
+            if medida['cronograma_valido'] is False:
+                print(f"ATENÇÃO: cronograma inválido com {tamanho} tarefas e folga {folga}")
+
+    return {
+        'metadados': {
+            'data': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'sementes': list(sementes),
+            'limite_nos': limite_nos,
+            'backjumping': backjumping,
+        },
+        'resultados': resultados,
+    }
+
+def chave_resultado(resultado):
+    return (resultado['numero_tarefas'], resultado['profissionais_disponiveis'], resultado['folga'], resultado['semente'])
+
+def comparar_resultados(relatorio_antes, relatorio_depois):
+    """
+    Mostra, para cada instância presente nos dois relatórios, a variação de nós e de tempo,
+    e no fim o tempo total de busca das instâncias em comum.
+    """
+    antes = {chave_resultado(resultado): resultado for resultado in relatorio_antes['resultados']}
+    print(f"{'Tarefas':>7} | {'Equipe':>6} | {'Folga':>5} | {'Semente':>7} | {'Nós antes':>9} | {'Nós depois':>10} | "
+          f"{'Tempo antes':>11} | {'Tempo depois':>12} | Ganho")
+    total_antes = total_depois = 0.0
+    for depois in relatorio_depois['resultados']:
+        anterior = antes.get(chave_resultado(depois))
+        if anterior is None:
+            continue
+        total_antes += anterior['tempo_busca_segundos']
+        total_depois += depois['tempo_busca_segundos']
+        ganho = anterior['tempo_busca_segundos'] / depois['tempo_busca_segundos'] \
+                if depois['tempo_busca_segundos'] > 0 else float('inf')
+        aviso = "" if anterior['resultado'] == depois['resultado'] else \
+                f"  (resultado mudou: {anterior['resultado']} -> {depois['resultado']})"
+        print(f"{depois['numero_tarefas']:7d} | {depois['profissionais_disponiveis'] or '-':>6} | "
+              f"{depois['folga']:5.2f} | {depois['semente']:7d} | {anterior['nos_explorados']:9d} | "
+              f"{depois['nos_explorados']:10d} | {anterior['tempo_busca_segundos']:11.3f} | "
+              f"{depois['tempo_busca_segundos']:12.3f} | {ganho:5.2f}x{aviso}")
+    if total_depois > 0:
+        print(f"\nTempo total de busca: {total_antes:.3f} s antes, {total_depois:.3f} s depois "
+              f"({total_antes / total_depois:.2f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de escala do ReformaCSP")
+    parser.add_argument("--saida", default=ARQUIVO_SAIDA, help="arquivo JSON com os resultados")
+    parser.add_argument("--tamanhos", type=int, nargs="*", default=TAMANHOS_SEM_RECURSOS,
+                        help="números de tarefas sem restrição de equipe")
+    parser.add_argument("--tamanhos-recursos", type=int, nargs="*", default=TAMANHOS_COM_RECURSOS,
+                        help="números de tarefas com equipe limitada")
+    parser.add_argument("--folgas", type=float, nargs="+", default=FOLGAS_PRAZO)
+    parser.add_argument("--sementes", type=int, nargs="+", default=[SEMENTE],
+                        help="uma instância por semente em cada tamanho e folga")
+    parser.add_argument("--profissionais", type=int, default=PROFISSIONAIS_BENCHMARK,
+                        help="tamanho da equipe nas instâncias com equipe limitada")
+    parser.add_argument("--limite-nos", type=int, default=LIMITE_NOS)
+    parser.add_argument("--backjumping", action="store_true",
+                        help="busca com backjumping dirigido por conflitos e nogoods")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"),
+                        help="compara dois arquivos de resultados em vez de rodar o benchmark")
+    argumentos = parser.parse_args()
+
+    if argumentos.comparar:
+        with open(argumentos.comparar[0], encoding="utf-8") as arquivo_antes, \
+             open(argumentos.comparar[1], encoding="utf-8") as arquivo_depois:
+            comparar_resultados(json.load(arquivo_antes), json.load(arquivo_depois))
+    else:
+        print("Benchmark ReformaCSP: DAGs de precedência aleatórios\n")
+        relatorio = executar_benchmark(argumentos.tamanhos, argumentos.tamanhos_recursos, argumentos.folgas,
+                                       argumentos.sementes, argumentos.limite_nos, argumentos.backjumping,
+                                       argumentos.profissionais)
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo_saida:
+            json.dump(relatorio, arquivo_saida, indent=2, ensure_ascii=False)
+        print(f"\nResultados gravados em {argumentos.saida}")
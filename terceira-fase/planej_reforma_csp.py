@@ -1,23 +1,337 @@
-import copy
+import collections
+import multiprocessing
+import random
+import time
+
+# Razões e conflitos são máscaras de bits por nível da busca (bit i = tarefa atribuída na
+# profundidade i): uniões baratas com | e a atribuição mais recente é o bit mais alto
+SEM_RAZAO = 0 # Limite que não depende de nenhuma atribuição (prazo, domínio inicial)
 
 class ReformaCSP:
-    def __init__(self, tarefas, duracoes, precedencias, prazo_maximo_dias, profissionais_disponiveis=None):
+    def __init__(self, tarefas, duracoes, precedencias, prazo_maximo_dias, profissionais_disponiveis=None,
+                 demanda_profissionais=None):
         self.tarefas = tarefas # Lista de nomes das tarefas
         self.duracoes = duracoes # Dicionário {tarefa: duracao_em_dias}
         self.precedencias = precedencias # Dicionário {tarefa: [lista_de_tarefas_precedentes]}
         self.prazo_maximo_dias = prazo_maximo_dias # Prazo final para todas as tarefas
-        
-        # Domínios: possíveis dias de início para cada tarefa
+
+        # Restrição de recurso cumulativa (opcional): em cada dia, a soma dos profissionais
+        # das tarefas em andamento não pode passar de profissionais_disponiveis.
+        self.profissionais_disponiveis = profissionais_disponiveis
+        # Dicionário {tarefa: profissionais_necessarios}; quem não aparece precisa de 1
+        demanda_profissionais = demanda_profissionais or {}
+        self.demanda_profissionais = {tarefa: demanda_profissionais.get(tarefa, 1) for tarefa in self.tarefas}
+
+        # Domínios: possíveis dias de início para cada tarefa.
+        # Como os dias possíveis são sempre um intervalo contínuo, cada domínio é guardado
+        # só pelos limites (inicio_min, inicio_max); inicio_min > inicio_max significa domínio vazio.
         self.dominios_iniciais = {}
         for tarefa in self.tarefas:
             # Se dura D dias, e começa no dia S, ocupa S, S+1, ..., S+D-1.
             # S <= prazo_maximo_dias - D
             max_inicio_possivel = prazo_maximo_dias - self.duracoes[tarefa]
             if max_inicio_possivel < 0: #  não cabe no prazo
-                 self.dominios_iniciais[tarefa] = []
+                 self.dominios_iniciais[tarefa] = (0, -1)
+            else:
+                self.dominios_iniciais[tarefa] = (0, max_inicio_possivel)
+
+        # Índice do grafo de precedências, montado uma vez: conjuntos de antecessores e sucessores
+        self.predecessores = {tarefa: set() for tarefa in self.tarefas}
+        self.sucessores = {tarefa: set() for tarefa in self.tarefas}
+        for tarefa in self.tarefas:
+            for antecessora in self.precedencias.get(tarefa, []):
+                if antecessora in self.sucessores: # Ignora precedências com tarefas desconhecidas
+                    self.predecessores[tarefa].add(antecessora)
+                    self.sucessores[antecessora].add(tarefa)
+        self.ordem_topologica = self.calcular_ordem_topologica()
+        # Tarefas sem sucessoras: o fim delas define a duração total (makespan) da obra
+        self.tarefas_finais = [tarefa for tarefa in self.tarefas if not self.sucessores[tarefa]]
+
+        # Heuristicas da busca (trocadas pelo portfólio em configurar_heuristicas)
+        self.heuristica_variavel = 'mrv'
+        self.heuristica_valor = 'cedo'
+        self.aleatorio = None # random.Random para desempates e valores aleatórios
+        # Evento (multiprocessing.Event) que, quando ligado, interrompe a busca
+        self.evento_parada = None
+        # Número máximo de nós da busca (None = sem limite); usado pelos reinícios do portfólio
+        self.limite_nos = None
+        # Contadores da última busca (ver iniciar_estatisticas_busca)
+        self.iniciar_estatisticas_busca()
+
+        # Caminho crítico antes da busca: cada domínio vira [início mais cedo, início mais tarde].
+        # Se algum ficar vazio, o prazo é inviável e nem é preciso buscar.
+        self.reiniciar_dominios()
+        self.viavel = self.propagar_caminho_critico(self.ordem_topologica)
+        if self.profissionais_disponiveis is not None and \
+           any(demanda > self.profissionais_disponiveis for demanda in self.demanda_profissionais.values()):
+            self.viavel = False # Alguma tarefa sozinha já precisa de mais gente do que existe
+        self.dominios_iniciais = {tarefa: (self.dominio_min[tarefa], self.dominio_max[tarefa])
+                                  for tarefa in self.tarefas}
+        self.reiniciar_dominios()
+
+    def calcular_ordem_topologica(self):
+        """Ordem de Kahn das tarefas; tarefas presas em ciclos vão para o final."""
+        grau_entrada = {tarefa: len(self.predecessores[tarefa]) for tarefa in self.tarefas}
+        fila = collections.deque(tarefa for tarefa in self.tarefas if grau_entrada[tarefa] == 0)
+        ordem = []
+        while fila:
+            tarefa = fila.popleft()
+            ordem.append(tarefa)
+            for sucessora in self.sucessores[tarefa]:
+                grau_entrada[sucessora] -= 1
+                if grau_entrada[sucessora] == 0:
+                    fila.append(sucessora)
+        if len(ordem) < len(self.tarefas):
+            ja_ordenadas = set(ordem)
+            ordem.extend(tarefa for tarefa in self.tarefas if tarefa not in ja_ordenadas)
+        return ordem
+
+    def propagar_caminho_critico(self, tarefas_alteradas):
+        """
+        Propagação de limites pelo grafo de precedências (início mais cedo / mais tarde).
+        Se o início mínimo de uma tarefa sobe, o dos sucessores pode subir; se o início
+        máximo desce, o dos antecessores pode descer. Só as tarefas afetadas entram na fila.
+        Retorna False se algum domínio ficar vazio.
+        """
+        fila = collections.deque(tarefas_alteradas)
+        na_fila = set(fila)
+        while fila:
+            tarefa = fila.popleft()
+            na_fila.discard(tarefa)
+            if self.dominio_min[tarefa] > self.dominio_max[tarefa]:
+                self.conflito = self.razao_min[tarefa] | self.razao_max[tarefa]
+                return False
+
+            # Sucessores só podem começar depois do fim mais cedo desta tarefa
+            fim_mais_cedo = self.dominio_min[tarefa] + self.duracoes[tarefa]
+            for sucessora in self.sucessores[tarefa]:
+                if fim_mais_cedo > self.dominio_min[sucessora]:
+                    if not self.reduzir_dominio(sucessora, fim_mais_cedo, self.dominio_max[sucessora],
+                                                razao_min=self.razao_min[tarefa]):
+                        return False
+                    if sucessora not in na_fila:
+                        fila.append(sucessora)
+                        na_fila.add(sucessora)
+
+            # Antecessores precisam terminar antes do início mais tarde desta tarefa
+            for antecessora in self.predecessores[tarefa]:
+                inicio_mais_tarde = self.dominio_max[tarefa] - self.duracoes[antecessora]
+                if inicio_mais_tarde < self.dominio_max[antecessora]:
+                    if not self.reduzir_dominio(antecessora, self.dominio_min[antecessora], inicio_mais_tarde,
+                                                razao_max=self.razao_max[tarefa]):
+                        return False
+                    if antecessora not in na_fila:
+                        fila.append(antecessora)
+                        na_fila.add(antecessora)
+        return True
+
+    def reiniciar_dominios(self):
+        """Volta os domínios atuais para os iniciais e esvazia a trilha de desfazer."""
+        self.dominio_min = {tarefa: limites[0] for tarefa, limites in self.dominios_iniciais.items()}
+        self.dominio_max = {tarefa: limites[1] for tarefa, limites in self.dominios_iniciais.items()}
+        # Razões dos limites atuais: máscara das atribuições que forçaram cada limite.
+        # Usadas pelo backjumping para saber para qual atribuição voltar.
+        self.razao_min = {tarefa: SEM_RAZAO for tarefa in self.tarefas}
+        self.razao_max = {tarefa: SEM_RAZAO for tarefa in self.tarefas}
+        # Trilha: (tarefa, min_antigo, max_antigo, razao_min_antiga, razao_max_antiga)
+        # de cada domínio alterado, em ordem
+        self.trilha = []
+        # Máscara das atribuições responsáveis pela última falha detectada
+        self.conflito = SEM_RAZAO
+        # Só o backjumping precisa das razões (as do perfil de recursos são mais caras de calcular)
+        self.registrar_conflitos = False
+        # Com registrar_conflitos: bit do nível de cada tarefa atribuída e tarefa de cada nível
+        self.bit_atribuicao = {}
+        self.tarefa_no_nivel = [None] * len(self.tarefas)
+        # Prazo usado pela busca; o modo de otimização o reduz a cada cronograma melhor
+        self.prazo_efetivo = self.prazo_maximo_dias
+        # Perfil de uso: profissionais ocupados em cada dia pelas tarefas já atribuídas
+        self.uso_por_dia = [0] * max(0, self.prazo_maximo_dias)
+        # Máscara das atribuições que ocupam cada dia; só mantida com registrar_conflitos
+        # (razões do backjumping)
+        self.tarefas_por_dia = [0] * max(0, self.prazo_maximo_dias)
+
+    def iniciar_estatisticas_busca(self, **contadores):
+        """
+        Zera self.estatisticas_busca para uma nova busca e o retorna. Todo modo de busca
+        conta nos_explorados, marca busca_interrompida quando para antes de responder
+        (limite_nos ou evento_parada) e mede tempo_segundos; os contadores próprios
+        do modo entram como argumentos nomeados.
+        """
+        self.estatisticas_busca = {'nos_explorados': 0, 'busca_interrompida': False,
+                                   'tempo_segundos': 0.0, **contadores}
+        return self.estatisticas_busca
+
+    def tamanho_dominio(self, tarefa):
+        return max(0, self.dominio_max[tarefa] - self.dominio_min[tarefa] + 1)
+
+    def reduzir_dominio(self, tarefa, novo_min, novo_max, razao_min=SEM_RAZAO, razao_max=SEM_RAZAO):
+        """
+        Estreita o domínio da tarefa para [novo_min, novo_max] (interseção com o atual),
+        guardando os limites antigos na trilha. razao_min/razao_max são as tarefas
+        atribuídas que justificam cada novo limite. Retorna False se o domínio ficar vazio
+        (e deixa em self.conflito as tarefas responsáveis).
+        """
+        min_antigo, max_antigo = self.dominio_min[tarefa], self.dominio_max[tarefa]
+        if novo_min > min_antigo or novo_max < max_antigo:
+            self.trilha.append((tarefa, min_antigo, max_antigo, self.razao_min[tarefa], self.razao_max[tarefa]))
+            if novo_min > min_antigo:
+                self.dominio_min[tarefa] = novo_min
+                self.razao_min[tarefa] = razao_min
+            if novo_max < max_antigo:
+                self.dominio_max[tarefa] = novo_max
+                self.razao_max[tarefa] = razao_max
+        if self.dominio_min[tarefa] > self.dominio_max[tarefa]:
+            self.conflito = self.razao_min[tarefa] | self.razao_max[tarefa]
+            return False
+        return True
+
+    def marcar_trilha(self):
+        """Ponto da trilha para onde o backtrack volta se o ramo falhar."""
+        return len(self.trilha)
+
+    def desfazer_ate(self, marca):
+        """Restaura os domínios alterados depois de 'marca', do mais recente para o mais antigo."""
+        while len(self.trilha) > marca:
+            tarefa, min_antigo, max_antigo, razao_min_antiga, razao_max_antiga = self.trilha.pop()
+            self.dominio_min[tarefa] = min_antigo
+            self.dominio_max[tarefa] = max_antigo
+            self.razao_min[tarefa] = razao_min_antiga
+            self.razao_max[tarefa] = razao_max_antiga
+
+    def atribuir(self, atribuicao, tarefa, data_inicio):
+        """Registra a tarefa na atribuição e ocupa os profissionais dela no perfil de uso."""
+        atribuicao[tarefa] = (data_inicio, data_inicio + self.duracoes[tarefa])
+        if self.registrar_conflitos:
+            nivel = len(atribuicao) - 1
+            self.bit_atribuicao[tarefa] = 1 << nivel
+            self.tarefa_no_nivel[nivel] = tarefa
+        if self.profissionais_disponiveis is not None:
+            demanda = self.demanda_profissionais[tarefa]
+            if self.registrar_conflitos:
+                bit = self.bit_atribuicao[tarefa]
+                for dia in range(data_inicio, data_inicio + self.duracoes[tarefa]):
+                    self.uso_por_dia[dia] += demanda
+                    self.tarefas_por_dia[dia] |= bit
+            else:
+                for dia in range(data_inicio, data_inicio + self.duracoes[tarefa]):
+                    self.uso_por_dia[dia] += demanda
+
+    def desatribuir(self, atribuicao, tarefa):
+        """Desfaz atribuir(): tira a tarefa da atribuição e libera os profissionais."""
+        data_inicio, data_fim = atribuicao.pop(tarefa)
+        if self.profissionais_disponiveis is not None:
+            demanda = self.demanda_profissionais[tarefa]
+            if self.registrar_conflitos:
+                sem_bit = ~self.bit_atribuicao[tarefa]
+                for dia in range(data_inicio, data_fim):
+                    self.uso_por_dia[dia] -= demanda
+                    self.tarefas_por_dia[dia] &= sem_bit
             else:
-                self.dominios_iniciais[tarefa] = list(range(max_inicio_possivel + 1))
+                for dia in range(data_inicio, data_fim):
+                    self.uso_por_dia[dia] -= demanda
+
+    def cabe_nos_recursos(self, tarefa, data_inicio):
+        """Verifica no perfil de uso se há profissionais livres em todos os dias da tarefa. O(duração)."""
+        if self.profissionais_disponiveis is None:
+            return True
+        livres_necessarios = self.profissionais_disponiveis - self.demanda_profissionais[tarefa]
+        for dia in range(data_inicio, data_inicio + self.duracoes[tarefa]):
+            if self.uso_por_dia[dia] > livres_necessarios:
+                return False
+        return True
+
+    def tarefas_nos_dias(self, dias):
+        """
+        Máscara das atribuições que ocupam algum dos 'dias' (as responsáveis por eles estarem
+        lotados), lidas do mapa de ocupação por dia mantido em atribuir/desatribuir.
+        """
+        mascara = SEM_RAZAO
+        for dia in dias:
+            mascara |= self.tarefas_por_dia[dia]
+        return mascara
+
+    def tarefas_da_mascara(self, mascara):
+        """Lista as tarefas atribuídas nos níveis cujos bits estão ligados na máscara."""
+        tarefas = []
+        while mascara:
+            bit = mascara & -mascara
+            tarefas.append(self.tarefa_no_nivel[bit.bit_length() - 1])
+            mascara ^= bit
+        return tarefas
+
+    def dias_lotados(self, tarefa, data_inicio):
+        """Dias da janela da tarefa em que não sobram profissionais suficientes para ela."""
+        livres_necessarios = self.profissionais_disponiveis - self.demanda_profissionais[tarefa]
+        return [dia for dia in range(data_inicio, data_inicio + self.duracoes[tarefa])
+                if self.uso_por_dia[dia] > livres_necessarios]
+
+    def primeiro_inicio_com_recursos(self, tarefa, inicio_min, inicio_max, dias_lotados=None):
+        """
+        Menor dia de início em [inicio_min, inicio_max] que cabe no perfil de uso, ou None.
+        Ao achar um dia lotado dentro da janela, pula direto para o dia seguinte a ele.
+        Se 'dias_lotados' for uma lista, recebe os dias lotados que causaram os pulos.
+        """
+        duracao = self.duracoes[tarefa]
+        livres_necessarios = self.profissionais_disponiveis - self.demanda_profissionais[tarefa]
+        inicio = inicio_min
+        while inicio <= inicio_max:
+            dia_lotado = None
+            for dia in range(inicio + duracao - 1, inicio - 1, -1): # Procura o último dia lotado da janela
+                if self.uso_por_dia[dia] > livres_necessarios:
+                    dia_lotado = dia
+                    break
+            if dia_lotado is None:
+                return inicio
+            if dias_lotados is not None:
+                dias_lotados.append(dia_lotado)
+            inicio = dia_lotado + 1
+        return None
+
+    def ultimo_inicio_com_recursos(self, tarefa, inicio_min, inicio_max, dias_lotados=None):
+        """Maior dia de início em [inicio_min, inicio_max] que cabe no perfil de uso, ou None."""
+        duracao = self.duracoes[tarefa]
+        livres_necessarios = self.profissionais_disponiveis - self.demanda_profissionais[tarefa]
+        inicio = inicio_max
+        while inicio >= inicio_min:
+            dia_lotado = None
+            for dia in range(inicio, inicio + duracao): # Procura o primeiro dia lotado da janela
+                if self.uso_por_dia[dia] > livres_necessarios:
+                    dia_lotado = dia
+                    break
+            if dia_lotado is None:
+                return inicio
+            if dias_lotados is not None:
+                dias_lotados.append(dia_lotado)
+            inicio = dia_lotado - duracao
+        return None
+
+    def propagar_recursos(self, tarefas_candidatas, atribuicao):
+        """
+        Propagação time-table: ajusta os limites de cada tarefa não atribuída para o
+        primeiro e o último início que cabem no perfil de uso. Retorna False se algum
+        domínio ficar vazio.
+        """
+        for tarefa in tarefas_candidatas:
+            inicio_min, inicio_max = self.dominio_min[tarefa], self.dominio_max[tarefa]
+            # Com backjumping, guarda os dias lotados para saber quais tarefas forçaram os limites
+            lotados_min = [] if self.registrar_conflitos else None
+            lotados_max = [] if self.registrar_conflitos else None
+
+            novo_min = self.primeiro_inicio_com_recursos(tarefa, inicio_min, inicio_max, lotados_min)
+            if novo_min is None:
+                if self.registrar_conflitos:
+                    self.conflito = (self.razao_min[tarefa] | self.razao_max[tarefa] |
+                                     self.tarefas_nos_dias(lotados_min))
+                return False
+            novo_max = self.ultimo_inicio_com_recursos(tarefa, novo_min, inicio_max, lotados_max)
 
+            # Sem dias lotados o limite não mudou e a razão nem é guardada
+            razao_min = self.razao_min[tarefa] | self.tarefas_nos_dias(lotados_min) if lotados_min else SEM_RAZAO
+            razao_max = self.razao_max[tarefa] | self.tarefas_nos_dias(lotados_max) if lotados_max else SEM_RAZAO
+            if not self.reduzir_dominio(tarefa, novo_min, novo_max, razao_min, razao_max):
+                return False
+        return True
 
     def eh_consistente(self, tarefa_atual, data_inicio_atual, atribuicao):
         """
@@ -30,110 +344,587 @@ class ReformaCSP:
 
         # Se a tarefa termina no dia X, ela ocupa até o final do dia X-1.
         # Então, data_fim_atual_calculada (dia seguinte ao último dia) deve ser <= prazo_maximo_dias
-        if data_fim_atual_calculada > self.prazo_maximo_dias:
+        # (ou ao prazo já apertado pelo modo de otimização)
+        if data_fim_atual_calculada > self.prazo_efetivo:
+            self.conflito = SEM_RAZAO
             return False
 
-        # Iterar sobre todas as tarefas já atribuídas para checar conflitos de precedência
-        for tarefa_ja_atribuida, (inicio_ja_atribuida, fim_ja_atribuida_calculada) in atribuicao.items():
-            # tarefa_atual deve começar DEPOIS ou NO MESMO DIA que tarefa_ja_atribuida terminar
-            if tarefa_ja_atribuida in self.precedencias.get(tarefa_atual, []):
-                if data_inicio_atual < fim_ja_atribuida_calculada:
-                    return False
-            
-            #tarefa_ja_atribuida deve começar DEPOIS ou NO MESMO DIA que tarefa_atual terminar
-            if tarefa_atual in self.precedencias.get(tarefa_ja_atribuida, []):
-                if inicio_ja_atribuida < data_fim_atual_calculada:
-                    return False
+        # Só as tarefas ligadas a tarefa_atual no grafo de precedências podem conflitar
+        for antecessora in self.predecessores[tarefa_atual]:
+            # tarefa_atual deve começar DEPOIS ou NO MESMO DIA que a antecessora terminar
+            if antecessora in atribuicao and data_inicio_atual < atribuicao[antecessora][1]:
+                if self.registrar_conflitos:
+                    self.conflito = self.bit_atribuicao[antecessora]
+                return False
+
+        for sucessora in self.sucessores[tarefa_atual]:
+            # a sucessora deve começar DEPOIS ou NO MESMO DIA que tarefa_atual terminar
+            if sucessora in atribuicao and atribuicao[sucessora][0] < data_fim_atual_calculada:
+                if self.registrar_conflitos:
+                    self.conflito = self.bit_atribuicao[sucessora]
+                return False
+
+        # Profissionais livres em todos os dias da tarefa (perfil de uso incremental)
+        if not self.cabe_nos_recursos(tarefa_atual, data_inicio_atual):
+            if self.registrar_conflitos:
+                self.conflito = self.tarefas_nos_dias(self.dias_lotados(tarefa_atual, data_inicio_atual))
+            return False
         return True
 
-    def selecionar_variavel_nao_atribuida(self, atribuicao, dominios_atuais):
-        """ Heurística MRV (Minimum Remaining Values). """
-        nao_atribuidas = [t for t in self.tarefas if t not in atribuicao]
-        if not nao_atribuidas:
+    def limite_inferior_makespan(self):
+        """
+        Menor makespan ainda possível neste nó: o maior fim mais cedo entre as tarefas finais.
+        Como os inícios mínimos já vêm propagados pelo caminho crítico, olhar só as tarefas
+        finais basta, e o custo é O(tarefas finais) por nó.
+        """
+        limite = 0
+        for tarefa in self.tarefas_finais:
+            fim_mais_cedo = self.dominio_min[tarefa] + self.duracoes[tarefa]
+            if fim_mais_cedo > limite:
+                limite = fim_mais_cedo
+        return limite
+
+    def aplicar_prazo_efetivo(self):
+        """
+        Traz o fim das tarefas finais para dentro do prazo_efetivo e propaga para trás.
+        Usado depois que o prazo é apertado: os domínios restaurados pela trilha podem
+        ainda refletir o prazo antigo. Retorna False se algum domínio ficar vazio.
+        """
+        alteradas = []
+        for tarefa in self.tarefas_finais:
+            inicio_mais_tarde = self.prazo_efetivo - self.duracoes[tarefa]
+            if self.dominio_max[tarefa] > inicio_mais_tarde:
+                if not self.reduzir_dominio(tarefa, self.dominio_min[tarefa], inicio_mais_tarde):
+                    return False
+                alteradas.append(tarefa)
+        return self.propagar_caminho_critico(alteradas)
+
+    def configurar_heuristicas(self, heuristica_variavel='mrv', heuristica_valor='cedo', semente=None):
+        """
+        Escolhe a ordem da busca.
+        heuristica_variavel: 'mrv' (menor domínio), 'folga' (menor início mais tarde),
+                             'grau' (mais sucessoras pendentes, desempate por MRV) ou
+                             'topologica' (primeira pendente na ordem topológica).
+        heuristica_valor: 'cedo' (dias mais cedo primeiro), 'tarde' ou 'aleatorio'.
+        Com semente, os empates entre variáveis são desfeitos ao acaso.
+        """
+        if heuristica_variavel not in ('mrv', 'folga', 'grau', 'topologica'):
+            raise ValueError(f"Heurística de variável desconhecida: {heuristica_variavel}")
+        if heuristica_valor not in ('cedo', 'tarde', 'aleatorio'):
+            raise ValueError(f"Heurística de valor desconhecida: {heuristica_valor}")
+        self.heuristica_variavel = heuristica_variavel
+        self.heuristica_valor = heuristica_valor
+        self.aleatorio = random.Random(semente) if semente is not None or heuristica_valor == 'aleatorio' else None
+
+    def selecionar_variavel_nao_atribuida(self, atribuicao):
+        """ Heurística MRV (Minimum Remaining Values), ou a escolhida em configurar_heuristicas. """
+        if self.heuristica_variavel == 'topologica':
+            for tarefa in self.ordem_topologica:
+                if tarefa not in atribuicao:
+                    return tarefa
             return None
 
         melhor_tarefa = None
-        menor_tamanho_dominio = float('inf')
+        melhor_chave = None
+        empates = 0
 
         for tarefa in self.tarefas: # Itera na ordem original para desempate consistente
-            if tarefa in nao_atribuidas:
-                tamanho_dominio = len(dominios_atuais[tarefa])
+            if tarefa not in atribuicao:
+                tamanho_dominio = self.tamanho_dominio(tarefa)
                 if tamanho_dominio == 0: # Se algum domínio está vazio devido a FC, essa é uma falha
                     return tarefa # O backtrack vai falhar para ela.
-                if tamanho_dominio < menor_tamanho_dominio:
-                    menor_tamanho_dominio = tamanho_dominio
+                if self.heuristica_variavel == 'mrv':
+                    chave = tamanho_dominio
+                elif self.heuristica_variavel == 'folga':
+                    chave = (self.dominio_max[tarefa], tamanho_dominio)
+                else: # 'grau'
+                    pendentes = sum(1 for sucessora in self.sucessores[tarefa] if sucessora not in atribuicao)
+                    chave = (-pendentes, tamanho_dominio)
+                if melhor_chave is None or chave < melhor_chave:
+                    melhor_chave = chave
                     melhor_tarefa = tarefa
-        
-        if melhor_tarefa is None and nao_atribuidas:
-            return nao_atribuidas[0]
+                    empates = 1
+                elif chave == melhor_chave and self.aleatorio is not None:
+                    empates += 1 # Sorteio uniforme entre as empatadas, sem guardar a lista
+                    if self.aleatorio.randrange(empates) == 0:
+                        melhor_tarefa = tarefa
+
         return melhor_tarefa
 
 
-    def ordenar_valores_dominio(self, tarefa, atribuicao, dominios_atuais):
-        """ Tenta os dias de início mais cedo primeiro. """
-        return sorted(list(dominios_atuais[tarefa]))
+    def ordenar_valores_dominio(self, tarefa, atribuicao):
+        """ Tenta os dias de início mais cedo primeiro (ou a ordem escolhida em configurar_heuristicas). """
+        valores = range(self.dominio_min[tarefa], self.dominio_max[tarefa] + 1)
+        if self.heuristica_valor == 'tarde':
+            return reversed(valores)
+        if self.heuristica_valor == 'aleatorio':
+            valores = list(valores)
+            self.aleatorio.shuffle(valores)
+        return valores
 
-    def forward_checking(self, tarefa_atribuida, data_inicio_atribuida, dominios_param, atribuicao_completa):
+    def forward_checking(self, tarefa_atribuida, data_inicio_atribuida, atribuicao_completa):
         """
-        Forward Checking
-        Retorna uma NOVA CÓPIA dos domínios atualizados, ou None se houver a inconsistência.
-        dominios_param: domínios atuais antes desta atribuição ser considerada definitiva.
-        atribuicao_completa: inclui a tarefa_atribuida e seu valor.
+        Forward Checking com propagação do caminho crítico e dos recursos.
+        Fixa o domínio de 'tarefa_atribuida' no dia escolhido e propaga os novos limites
+        para as tarefas afetadas (registrando na trilha). Com profissionais limitados, as
+        tarefas cuja janela encosta nos dias recém-ocupados são ajustadas ao perfil de uso,
+        e as duas propagações se alternam até nada mais mudar. Retorna False se houver
+        inconsistência; quem chama desfaz as mudanças com desfazer_ate().
+        atribuicao_completa: inclui a tarefa_atribuida e seu valor (já em atribuir()).
         """
-        novos_dominios = copy.deepcopy(dominios_param) # cópia
-        data_fim_atribuida_calculada = data_inicio_atribuida + self.duracoes[tarefa_atribuida]
+        propria_tarefa = self.bit_atribuicao[tarefa_atribuida] if self.registrar_conflitos else SEM_RAZAO
+        if not self.reduzir_dominio(tarefa_atribuida, data_inicio_atribuida, data_inicio_atribuida,
+                                    propria_tarefa, propria_tarefa):
+            return False # Inconsistência
 
-        for tarefa_nao_atribuida_nome in self.tarefas:
-            # processa tarefas que ainda não foram atribuídas em 'atribuicao_completa' e não sendo a própria tarefa_atribuida
-            if tarefa_nao_atribuida_nome not in atribuicao_completa or tarefa_nao_atribuida_nome == tarefa_atribuida:
-                 if tarefa_nao_atribuida_nome != tarefa_atribuida :
-                    if tarefa_atribuida in self.precedencias.get(tarefa_nao_atribuida_nome, []):
-                        # tarefa_nao_atribuida_nome deve começar APÓS ou NO MESMO DIA que tarefa_atribuida terminar
-                        dominio_original_na = novos_dominios[tarefa_nao_atribuida_nome]
-                        dominio_filtrado = [
-                            dia for dia in dominio_original_na if dia >= data_fim_atribuida_calculada
-                        ]
-                        if not dominio_filtrado and dominio_original_na: 
-                            return None # Inconsistência
-                        novos_dominios[tarefa_nao_atribuida_nome] = dominio_filtrado
-        return novos_dominios
+        pendentes_precedencia = [tarefa_atribuida]
+        pendentes_recurso = set()
+        if self.profissionais_disponiveis is not None:
+            data_fim_atribuida = data_inicio_atribuida + self.duracoes[tarefa_atribuida]
+            for tarefa in self.tarefas:
+                if tarefa not in atribuicao_completa and \
+                   self.dominio_min[tarefa] < data_fim_atribuida and \
+                   self.dominio_max[tarefa] + self.duracoes[tarefa] > data_inicio_atribuida:
+                    pendentes_recurso.add(tarefa)
 
+        while pendentes_precedencia:
+            marca = self.marcar_trilha()
+            if not self.propagar_caminho_critico(pendentes_precedencia):
+                return False
+            if self.profissionais_disponiveis is None:
+                return True
 
-def backtracking_search_csp(csp):
-    # A primeira chamada ao backtrack usa os domínios iniciais
-    return backtrack({}, csp, csp.dominios_iniciais)
+            # Tarefas com limites novos precisam ser conferidas de novo no perfil de uso
+            pendentes_recurso.update(entrada[0] for entrada in self.trilha[marca:]
+                                     if entrada[0] not in atribuicao_completa)
+            marca = self.marcar_trilha()
+            if not self.propagar_recursos(pendentes_recurso, atribuicao_completa):
+                return False
+            pendentes_recurso = set()
+            pendentes_precedencia = list({entrada[0] for entrada in self.trilha[marca:]})
+        return True
+
+
+def backtracking_search_csp(csp, otimizar_makespan=False, backjumping=False, limite_nos=None):
+    """
+    Retorna o primeiro cronograma viável, ou None; os contadores da busca ficam em
+    csp.estatisticas_busca. limite_nos interrompe a busca depois desse número de nós
+    (busca_interrompida fica True).
+    Com otimizar_makespan=True faz branch-and-bound e retorna o cronograma de menor
+    duração total (se interrompido, o melhor encontrado até ali).
+    Com backjumping=True usa backjumping dirigido por conflitos e aprendizado de nogoods.
+    O branch-and-bound não tem versão com backjumping: pedir os dois levanta ValueError.
+    """
+    if otimizar_makespan and backjumping:
+        raise ValueError("otimizar_makespan e backjumping não podem ser usados juntos")
+    if otimizar_makespan:
+        return branch_and_bound_makespan(csp, limite_nos=limite_nos)
+    if backjumping:
+        return busca_com_backjumping(csp, limite_nos=limite_nos)
+    estatisticas = csp.iniciar_estatisticas_busca()
+    if not csp.viavel: # O caminho crítico já mostrou que o prazo não é suficiente
+        return None
+    inicio_execucao = time.perf_counter()
+    # A busca começa dos domínios iniciais
+    csp.reiniciar_dominios()
+    csp.limite_nos = limite_nos
+    solucao = backtrack({}, csp)
+    estatisticas['tempo_segundos'] = time.perf_counter() - inicio_execucao
+    return solucao
+
+def branch_and_bound_makespan(csp, limite_nos=None):
+    """
+    Busca o cronograma de menor makespan (dia seguinte ao último dia de trabalho) em uma
+    única execução. Cada cronograma encontrado vira o incumbente e o prazo da busca é
+    apertado no lugar para makespan - 1; ramos cujo limite inferior do caminho crítico
+    restante não melhora o incumbente são podados.
+    Se limite_nos interromper a busca, retorna o incumbente, sem prova de que é o ótimo;
+    makespan_otimo em csp.estatisticas_busca é então só o melhor encontrado.
+    """
+    estatisticas = csp.iniciar_estatisticas_busca(podas_por_limite=0, solucoes_melhoradas=0,
+                                                   makespan_otimo=None)
+    estado = {'melhor_solucao': None, 'estatisticas': estatisticas}
+    inicio_execucao = time.perf_counter()
+
+    if csp.viavel:
+        csp.reiniciar_dominios()
+        csp.limite_nos = limite_nos
+        backtrack_makespan({}, csp, estado)
+        csp.reiniciar_dominios() # Devolve o csp com o prazo original
+
+    if estado['melhor_solucao'] is not None:
+        estatisticas['makespan_otimo'] = max((fim for _, fim in estado['melhor_solucao'].values()), default=0)
+    estatisticas['tempo_segundos'] = time.perf_counter() - inicio_execucao
+    return estado['melhor_solucao']
+
+def backtrack_makespan(atribuicao_atual, csp, estado):
+    """ Backtracking do branch-and-bound: continua depois de cada solução até esgotar a árvore. """
+    estatisticas = estado['estatisticas']
+    estatisticas['nos_explorados'] += 1
+    if csp.limite_nos is not None and estatisticas['nos_explorados'] > csp.limite_nos:
+        estatisticas['busca_interrompida'] = True
+        return
+
+    # Limite inferior: se nem o caminho crítico restante cabe no prazo atual, poda o ramo
+    if csp.limite_inferior_makespan() > csp.prazo_efetivo:
+        estatisticas['podas_por_limite'] += 1
+        return
+
+    if len(atribuicao_atual) == len(csp.tarefas): # Cronograma completo e melhor que o incumbente
+        makespan = max((fim for _, fim in atribuicao_atual.values()), default=0)
+        estado['melhor_solucao'] = dict(atribuicao_atual)
+        estatisticas['solucoes_melhoradas'] += 1
+        csp.prazo_efetivo = makespan - 1 # Daqui em diante só interessa terminar antes
+        return
+
+    # O prazo pode ter sido apertado em outro ramo depois que estes domínios foram calculados
+    marca_prazo = csp.marcar_trilha()
+    if not csp.aplicar_prazo_efetivo():
+        csp.desfazer_ate(marca_prazo)
+        estatisticas['podas_por_limite'] += 1
+        return
+
+    tarefa_selecionada = csp.selecionar_variavel_nao_atribuida(atribuicao_atual)
+    if tarefa_selecionada is not None:
+        for data_inicio_valor in csp.ordenar_valores_dominio(tarefa_selecionada, atribuicao_atual):
+            if data_inicio_valor > csp.dominio_max[tarefa_selecionada]:
+                break # O domínio encolheu quando o prazo foi apertado durante este laço
+            if csp.eh_consistente(tarefa_selecionada, data_inicio_valor, atribuicao_atual):
+                csp.atribuir(atribuicao_atual, tarefa_selecionada, data_inicio_valor)
+                marca = csp.marcar_trilha()
+                if csp.forward_checking(tarefa_selecionada, data_inicio_valor, atribuicao_atual):
+                    backtrack_makespan(atribuicao_atual, csp, estado)
+                csp.desfazer_ate(marca)
+                csp.desatribuir(atribuicao_atual, tarefa_selecionada)
+                if estatisticas['busca_interrompida']:
+                    break
+
+                # Com o prazo apertado, o restante do domínio pode ter ficado inviável
+                if not csp.aplicar_prazo_efetivo():
+                    break
+
+    csp.desfazer_ate(marca_prazo)
+
+LIMITE_NOGOODS = 2000 # Tamanho máximo da base de nogoods; os menos usados recentemente saem primeiro
+
+def busca_com_backjumping(csp, limite_nogoods=LIMITE_NOGOODS, limite_nos=None):
+    """
+    Backtracking com backjumping dirigido por conflitos (CBJ) e aprendizado de nogoods.
+    Cada falha devolve o conjunto de tarefas atribuídas responsáveis por ela; se a tarefa
+    do nível atual não está nesse conjunto, a busca volta direto para a responsável.
+    Quando um nó esgota os valores, a combinação das atribuições do conflito vira um
+    nogood, e combinações já conhecidas como impossíveis não são exploradas de novo.
+    O aprendizado é limitado por relevância: um nogood só vale enquanto todas as suas
+    atribuições, menos a mais recente, continuam de pé, e é esquecido quando a busca
+    desfaz alguma delas. limite_nos interrompe a busca como no backtracking simples.
+    """
+    estado = {
+        # {(tarefa, inicio): {nogood, ...}}: cada nogood é indexado só pela atribuição mais recente
+        'nogoods_por_valor': {},
+        # {nivel: {nogood, ...}}: nogoods que deixam de valer quando o nível é desfeito
+        'nogoods_por_nivel': {},
+        # Base LRU {nogood: (par_indice, nivel, mascara)}; nogood = frozenset de (tarefa, inicio)
+        # e mascara = bits das demais atribuições dele, já no formato dos conflitos
+        'nogoods': collections.OrderedDict(),
+        'limite_nogoods': limite_nogoods,
+        'estatisticas': csp.iniciar_estatisticas_busca(saltos=0, nogoods_aprendidos=0,
+                                                        nogoods_esquecidos=0, podas_por_nogood=0),
+    }
+    inicio_execucao = time.perf_counter()
 
-def backtrack(atribuicao_atual, csp, dominios_atuais_param):
+    solucao = None
+    if csp.viavel:
+        csp.reiniciar_dominios()
+        csp.limite_nos = limite_nos
+        csp.registrar_conflitos = True
+        solucao, _ = backtrack_com_backjumping({}, csp, estado)
+        csp.registrar_conflitos = False
+
+    estado['estatisticas']['tempo_segundos'] = time.perf_counter() - inicio_execucao
+    return solucao
+
+def aprender_nogood(estado, conflito, atribuicao, csp):
+    """
+    Guarda a combinação {tarefa: inicio} das atribuições da máscara de conflito. O nogood é
+    indexado pela atribuição mais profunda (a que a busca vai trocar) e registrado no nível
+    da segunda mais profunda: ao desfazer esse nível ele é esquecido.
+    Se as duas estão em níveis vizinhos o nogood não é guardado: a mais profunda só volta
+    ao mesmo valor depois que a busca passar pelo nível de cima, e aí ele já foi esquecido.
+    """
+    if not conflito:
+        return
+    nivel_indice = conflito.bit_length() - 1
+    demais = conflito ^ (1 << nivel_indice)
+    nivel_relevancia = demais.bit_length() - 1 # -1 (sem outras atribuições): vale para sempre
+    if nivel_relevancia == nivel_indice - 1:
+        return
+    nogood = frozenset((tarefa, atribuicao[tarefa][0]) for tarefa in csp.tarefas_da_mascara(conflito))
+    if nogood in estado['nogoods']:
+        return
+    tarefa_indice = csp.tarefa_no_nivel[nivel_indice]
+    par_indice = (tarefa_indice, atribuicao[tarefa_indice][0])
+    estado['nogoods'][nogood] = (par_indice, nivel_relevancia, demais)
+    estado['nogoods_por_valor'].setdefault(par_indice, set()).add(nogood)
+    estado['nogoods_por_nivel'].setdefault(nivel_relevancia, set()).add(nogood)
+    estado['estatisticas']['nogoods_aprendidos'] += 1
+    if len(estado['nogoods']) > estado['limite_nogoods']:
+        remover_nogood(estado, next(iter(estado['nogoods']))) # O menos usado recentemente
+
+def remover_nogood(estado, nogood):
+    par_indice, nivel_relevancia, _ = estado['nogoods'].pop(nogood)
+    descartar_do_indice(estado, par_indice, nogood)
+    estado['nogoods_por_nivel'][nivel_relevancia].discard(nogood)
+    estado['estatisticas']['nogoods_esquecidos'] += 1
+
+def descartar_do_indice(estado, par_indice, nogood):
+    """Tira o nogood do índice por valor; valores sem nogoods saem do índice."""
+    nogoods_do_valor = estado['nogoods_por_valor'][par_indice]
+    nogoods_do_valor.discard(nogood)
+    if not nogoods_do_valor:
+        del estado['nogoods_por_valor'][par_indice]
+
+def esquecer_nogoods(estado, nivel):
+    """Ao desfazer a atribuição do 'nivel', esquece os nogoods que dependiam dela."""
+    for nogood in estado['nogoods_por_nivel'].pop(nivel, ()):
+        par_indice, _, _ = estado['nogoods'].pop(nogood)
+        descartar_do_indice(estado, par_indice, nogood)
+        estado['estatisticas']['nogoods_esquecidos'] += 1
+
+def nogood_violado(estado, tarefa, data_inicio):
+    """
+    Retorna a máscara das demais atribuições de um nogood violado por (tarefa, data_inicio),
+    ou None.
+    Pela regra de relevância, as demais atribuições de um nogood guardado continuam de pé,
+    então basta consultar o índice: O(1), sem percorrer os nogoods.
+    """
+    nogoods = estado['nogoods_por_valor'].get((tarefa, data_inicio))
+    if not nogoods:
+        return None
+    nogood = next(iter(nogoods))
+    estado['nogoods'].move_to_end(nogood) # Útil de novo: fica no fim da fila do LRU
+    return estado['nogoods'][nogood][2]
+
+def backtrack_com_backjumping(atribuicao_atual, csp, estado):
+    """
+    Retorna (solucao, None) se encontrou um cronograma, ou (None, conflito) com a
+    máscara das atribuições que explicam a falha deste ramo.
+    """
+    estatisticas = estado['estatisticas']
+    nogoods_por_valor = estado['nogoods_por_valor']
+    estatisticas['nos_explorados'] += 1
+    if csp.limite_nos is not None and estatisticas['nos_explorados'] > csp.limite_nos:
+        estatisticas['busca_interrompida'] = True
+        return None, SEM_RAZAO
+    if len(atribuicao_atual) == len(csp.tarefas): # Todas as tarefas foram atribuídas
+        return atribuicao_atual, None
+
+    tarefa_selecionada = csp.selecionar_variavel_nao_atribuida(atribuicao_atual)
+    if tarefa_selecionada is None:
+        return None, SEM_RAZAO
+    nivel_atual = len(atribuicao_atual)
+
+    # Os valores fora do domínio atual foram cortados pelas tarefas das razões dos limites
+    conflito_no = csp.razao_min[tarefa_selecionada] | csp.razao_max[tarefa_selecionada]
+    bit_selecionada = 1 << nivel_atual
+
+    for data_inicio_valor in csp.ordenar_valores_dominio(tarefa_selecionada, atribuicao_atual):
+        if not csp.eh_consistente(tarefa_selecionada, data_inicio_valor, atribuicao_atual):
+            conflito_no |= csp.conflito
+            continue
+
+        conflito_valor = nogood_violado(estado, tarefa_selecionada, data_inicio_valor) \
+                         if nogoods_por_valor else None
+        if conflito_valor is not None:
+            estatisticas['podas_por_nogood'] += 1
+            conflito_valor |= bit_selecionada # A própria tarefa, agora neste nível
+        else:
+            csp.atribuir(atribuicao_atual, tarefa_selecionada, data_inicio_valor)
+            marca = csp.marcar_trilha()
+
+            if not csp.forward_checking(tarefa_selecionada, data_inicio_valor, atribuicao_atual):
+                conflito_valor = csp.conflito
+            else:
+                resultado, conflito_filho = backtrack_com_backjumping(atribuicao_atual, csp, estado)
+                if resultado is not None:
+                    return resultado, None
+                conflito_valor = conflito_filho
+
+            csp.desfazer_ate(marca)
+            csp.desatribuir(atribuicao_atual, tarefa_selecionada)
+            if nivel_atual in estado['nogoods_por_nivel']:
+                esquecer_nogoods(estado, nivel_atual)
+            if estatisticas['busca_interrompida']: # Ramo incompleto: não explica nada, só volta
+                return None, SEM_RAZAO
+
+        if not conflito_valor & bit_selecionada:
+            # Nenhum valor desta tarefa resolveria: salta direto para a tarefa responsável
+            estatisticas['saltos'] += 1
+            return None, conflito_valor
+        conflito_no |= conflito_valor
+
+    conflito_no &= ~bit_selecionada
+    aprender_nogood(estado, conflito_no, atribuicao_atual, csp)
+    return None, conflito_no
+
+def backtrack(atribuicao_atual, csp):
     """ Algoritmo de Backtracking para resolver o CSP da reforma. """
+    estatisticas = csp.estatisticas_busca
+    estatisticas['nos_explorados'] += 1
+    nos_explorados = estatisticas['nos_explorados']
+    # Para quando o limite de nós do reinício acabar ou outro processo do portfólio já tiver terminado
+    if (csp.limite_nos is not None and nos_explorados > csp.limite_nos) or \
+       (csp.evento_parada is not None and nos_explorados % 256 == 0 and csp.evento_parada.is_set()):
+        estatisticas['busca_interrompida'] = True
+        return None
+
     if len(atribuicao_atual) == len(csp.tarefas): # Todas as tarefas foram atribuídas
         return atribuicao_atual # Solução encontrada
-    
-    tarefa_selecionada = csp.selecionar_variavel_nao_atribuida(atribuicao_atual, dominios_atuais_param)
-    
+
+    tarefa_selecionada = csp.selecionar_variavel_nao_atribuida(atribuicao_atual)
+
     if tarefa_selecionada is None:
         # se acontecer, significa que não há mais vars para atribuir, mas a atribuição não está completa
-        return None 
-    
-    #controle debug
-    # print(f"Tentando tarefa: {tarefa_selecionada}, Domínio atual: {dominios_atuais_param.get(tarefa_selecionada, [])}")
+        return None
 
-    for data_inicio_valor in csp.ordenar_valores_dominio(tarefa_selecionada, atribuicao_atual, dominios_atuais_param):
-        # Cria uma cópia da atribuição atual para este ramo da busca
-        nova_atribuicao_ramo = atribuicao_atual.copy()
+    #controle debug
+    # print(f"Tentando tarefa: {tarefa_selecionada}, Domínio atual: {csp.dominio_min[tarefa_selecionada]}..{csp.dominio_max[tarefa_selecionada]}")
 
-        if csp.eh_consistente(tarefa_selecionada, data_inicio_valor, nova_atribuicao_ramo):
-            data_fim_calculada = data_inicio_valor + csp.duracoes[tarefa_selecionada]
-            nova_atribuicao_ramo[tarefa_selecionada] = (data_inicio_valor, data_fim_calculada)
-            # Forward Checking: passa os domínios atuais para serem copiados e modificados
-            dominios_apos_fc = csp.forward_checking(tarefa_selecionada, data_inicio_valor, dominios_atuais_param, nova_atribuicao_ramo)
+    for data_inicio_valor in csp.ordenar_valores_dominio(tarefa_selecionada, atribuicao_atual):
+        if csp.eh_consistente(tarefa_selecionada, data_inicio_valor, atribuicao_atual):
+            # A atribuição, os domínios e o perfil de uso são alterados no lugar e desfeitos se o ramo falhar
+            csp.atribuir(atribuicao_atual, tarefa_selecionada, data_inicio_valor)
+            marca = csp.marcar_trilha()
 
-            if dominios_apos_fc is not None: # Se o Forward Checking não detectou inconsistência
-                resultado_recursao = backtrack(nova_atribuicao_ramo, csp, dominios_apos_fc)
+            if csp.forward_checking(tarefa_selecionada, data_inicio_valor, atribuicao_atual): # Sem inconsistência
+                resultado_recursao = backtrack(atribuicao_atual, csp)
                 if resultado_recursao is not None:
                     return resultado_recursao
-    
+
+            csp.desfazer_ate(marca)
+            csp.desatribuir(atribuicao_atual, tarefa_selecionada)
+            if estatisticas['busca_interrompida']:
+                return None
+
     return None # siginfica  q nenhuma solução encontrada a partir deste ponto
 
+
+# Portfólio paralelo: cada estratégia roda em um processo e a primeira que termina vence
+ESTRATEGIAS_PORTFOLIO = [
+    {'nome': 'mrv_cedo', 'variavel': 'mrv', 'valor': 'cedo', 'reinicios': False},
+    {'nome': 'folga_cedo', 'variavel': 'folga', 'valor': 'cedo', 'reinicios': False},
+    {'nome': 'topologica_cedo', 'variavel': 'topologica', 'valor': 'cedo', 'reinicios': False},
+    {'nome': 'grau_tarde', 'variavel': 'grau', 'valor': 'tarde', 'reinicios': False},
+    {'nome': 'mrv_aleatorio_reinicios', 'variavel': 'mrv', 'valor': 'aleatorio', 'reinicios': True},
+    {'nome': 'folga_cedo_reinicios', 'variavel': 'folga', 'valor': 'cedo', 'reinicios': True},
+]
+LIMITE_NOS_PRIMEIRO_REINICIO = 100
+FATOR_CRESCIMENTO_REINICIO = 1.5
+
+evento_parada_portfolio = None
+
+def inicializar_processo_portfolio(evento_parada):
+    """Guarda o evento de parada do portfólio no processo trabalhador."""
+    global evento_parada_portfolio
+    evento_parada_portfolio = evento_parada
+
+def executar_estrategia(csp, estrategia, semente=None, evento_parada=None):
+    """
+    Roda uma estratégia do portfólio até achar um cronograma, provar que não existe
+    ou ser interrompida pelo evento de parada.
+    Com reinícios, cada tentativa tem um limite de nós que cresce geometricamente e
+    uma nova semente; uma tentativa que termina sem estourar o limite é uma prova completa.
+    Ao terminar, o csp volta com as heurísticas e os limites de busca que tinha antes.
+    """
+    inicio_execucao = time.perf_counter()
+    configuracao_original = (csp.heuristica_variavel, csp.heuristica_valor, csp.aleatorio,
+                             csp.evento_parada, csp.limite_nos)
+    try:
+        csp.configurar_heuristicas(estrategia['variavel'], estrategia['valor'], semente)
+        csp.evento_parada = evento_parada
+        sorteio_reinicios = random.Random(semente)
+        limite_nos = LIMITE_NOS_PRIMEIRO_REINICIO if estrategia['reinicios'] else None
+        nos_explorados = 0
+        reinicios = 0
+
+        while True:
+            csp.reiniciar_dominios()
+            csp.limite_nos = limite_nos
+            estatisticas = csp.iniciar_estatisticas_busca()
+            solucao = backtrack({}, csp)
+            nos_explorados += estatisticas['nos_explorados']
+            if solucao is not None or not estatisticas['busca_interrompida']:
+                break # Achou, ou esgotou a árvore: em ambos os casos a resposta é definitiva
+            if csp.evento_parada is not None and csp.evento_parada.is_set():
+                break # Outra estratégia já respondeu
+            reinicios += 1
+            limite_nos = int(limite_nos * FATOR_CRESCIMENTO_REINICIO)
+            if csp.aleatorio is not None:
+                csp.aleatorio.seed(sorteio_reinicios.getrandbits(64))
+
+        concluida = solucao is not None or not estatisticas['busca_interrompida']
+    finally:
+        # Rodando no próprio processo, o csp é o do chamador: não deixa a estratégia grudada nele
+        csp.reiniciar_dominios()
+        (csp.heuristica_variavel, csp.heuristica_valor, csp.aleatorio,
+         csp.evento_parada, csp.limite_nos) = configuracao_original
+
+    return {
+        'estrategia': estrategia['nome'],
+        'solucao': dict(solucao) if solucao is not None else None,
+        'concluida': concluida, # False se foi interrompida antes de responder
+        'nos_explorados': nos_explorados,
+        'reinicios': reinicios,
+        'tempo_segundos': time.perf_counter() - inicio_execucao,
+    }
+
+def executar_estrategia_processo(parametros):
+    """Ponto de entrada do processo trabalhador: (csp, estrategia, semente)."""
+    csp, estrategia, semente = parametros
+    return executar_estrategia(csp, estrategia, semente, evento_parada_portfolio)
+
+def resolver_com_portfolio(csp, estrategias=None, processos=None, semente=None, tempo_limite=None):
+    """
+    Roda várias estratégias de busca em paralelo, uma por processo, e retorna
+    (cronograma, estatisticas) com a resposta da primeira que terminar; as demais são canceladas.
+    O cronograma é None se a estratégia vencedora provou que não há solução
+    (ou se o tempo_limite em segundos acabou antes de alguma responder).
+    """
+    estrategias = estrategias or ESTRATEGIAS_PORTFOLIO
+    estatisticas = {'estrategia_vencedora': None, 'nos_explorados': 0, 'reinicios': 0,
+                    'estrategias_canceladas': [], 'tempo_segundos': 0.0}
+    inicio_execucao = time.perf_counter()
+    if not csp.viavel: # O caminho crítico já mostrou que o prazo não é suficiente
+        return None, estatisticas
+
+    sorteio = random.Random(semente)
+    parametros = [(csp, estrategia, sorteio.getrandbits(64)) for estrategia in estrategias]
+    vencedor = None
+    evento_parada = multiprocessing.Event()
+    with multiprocessing.Pool(processos or len(estrategias), initializer=inicializar_processo_portfolio,
+                              initargs=(evento_parada,)) as pool:
+        resultados = pool.imap_unordered(executar_estrategia_processo, parametros)
+        try:
+            for _ in parametros:
+                restante = None if tempo_limite is None else \
+                    max(0.0, tempo_limite - (time.perf_counter() - inicio_execucao))
+                resultado = resultados.next(timeout=restante)
+                if resultado['concluida']:
+                    vencedor = resultado
+                    break
+        except multiprocessing.TimeoutError:
+            pass
+        evento_parada.set() # Avisa as estratégias que ainda estão rodando
+        # Sair do with encerra (terminate) os processos que não pararam sozinhos
+
+    if vencedor is not None:
+        estatisticas.update({'estrategia_vencedora': vencedor['estrategia'],
+                             'nos_explorados': vencedor['nos_explorados'],
+                             'reinicios': vencedor['reinicios']})
+    estatisticas['estrategias_canceladas'] = [estrategia['nome'] for estrategia in estrategias
+                                              if vencedor is None or estrategia['nome'] != vencedor['estrategia']]
+    estatisticas['tempo_segundos'] = time.perf_counter() - inicio_execucao
+    return (vencedor['solucao'] if vencedor is not None else None), estatisticas
+
 # exemplo teste -> pode modificar aqui o meu exemplo
 if __name__ == "__main__":
     print("Planejamento de Reforma de Cozinha - CSP")
@@ -154,18 +945,25 @@ if __name__ == "__main__":
         'Limpeza': ['Louças', 'Marcenaria', 'Pintura']
     }
     prazo_total_dias = 25 
+    profissionais_reforma = 2 # Equipe disponível por dia
+    demanda_reforma = {'Demolição': 2, 'Azulejos': 2} # As demais tarefas precisam de 1 profissional
 
-    csp_reforma = ReformaCSP(tarefas_reforma, duracoes_reforma, precedencias_reforma, prazo_total_dias)
+    csp_reforma = ReformaCSP(tarefas_reforma, duracoes_reforma, precedencias_reforma, prazo_total_dias,
+                             profissionais_reforma, demanda_reforma)
 
-    print("\nDomínios iniciais (dias de início possíveis para cada tarefa):")
-    for tarefa, dias in csp_reforma.dominios_iniciais.items():
-        if dias:
-            print(f"- {tarefa} (duração {csp_reforma.duracoes[tarefa]} dias): pode começar entre o dia {min(dias)} e {max(dias)}")
+    if not csp_reforma.viavel:
+        print("\nO caminho crítico das tarefas não cabe no prazo: o problema é inviável.")
+
+    print("\nDomínios iniciais após o caminho crítico (dias de início possíveis para cada tarefa):")
+    for tarefa, (inicio_min, inicio_max) in csp_reforma.dominios_iniciais.items():
+        if inicio_min <= inicio_max:
+            print(f"- {tarefa} (duração {csp_reforma.duracoes[tarefa]} dias): pode começar entre o dia {inicio_min} e {inicio_max}")
         else:
             print(f"- {tarefa} (duração {csp_reforma.duracoes[tarefa]} dias): NÃO HÁ DIAS POSSÍVEIS (verifique prazo e durações)")
 
 
-    print(f"\nBuscando solução com prazo máximo de {prazo_total_dias} dias (último dia de trabalho é {prazo_total_dias-1})...")
+    print(f"\nBuscando solução com prazo máximo de {prazo_total_dias} dias (último dia de trabalho é {prazo_total_dias-1}) "
+          f"e {profissionais_reforma} profissionais por dia...")
     solucao = backtracking_search_csp(csp_reforma)
 
     if solucao:
@@ -187,4 +985,43 @@ if __name__ == "__main__":
              print("ATENÇÃO: Projeto excedeu o prazo (considerando que o prazo é o dia seguinte ao último dia de trabalho).")
 
     else:
-        print("\n--- Nenhuma solução encontrada dentro do prazo e restrições. ---")
\ No newline at end of file
+        print("\n--- Nenhuma solução encontrada dentro do prazo e restrições. ---")
+
+    # Modo de otimização: o cronograma com a menor duração total
+    print("\nBuscando o cronograma de menor duração (branch-and-bound)...")
+    solucao_otima = backtracking_search_csp(csp_reforma, otimizar_makespan=True)
+    stats_otimizacao = csp_reforma.estatisticas_busca
+    if solucao_otima:
+        print(f"Menor duração possível: {stats_otimizacao['makespan_otimo']} dias "
+              f"(concluída ao final do Dia {stats_otimizacao['makespan_otimo'] - 1}).")
+        print(f"Nós explorados: {stats_otimizacao['nos_explorados']}, "
+              f"podas por limite: {stats_otimizacao['podas_por_limite']}, "
+              f"soluções melhoradas: {stats_otimizacao['solucoes_melhoradas']}")
+    else:
+        print("Nenhum cronograma viável para otimizar.")
+
+    # Backjumping: prova que um prazo um dia menor que o ótimo é impossível
+    if solucao_otima:
+        prazo_apertado = stats_otimizacao['makespan_otimo'] - 1
+        print(f"\nVerificando com backjumping se a reforma cabe em {prazo_apertado} dias...")
+        csp_apertado = ReformaCSP(tarefas_reforma, duracoes_reforma, precedencias_reforma, prazo_apertado,
+                                  profissionais_reforma, demanda_reforma)
+        solucao_apertada = backtracking_search_csp(csp_apertado, backjumping=True) if csp_apertado.viavel else None
+        print("Cronograma encontrado." if solucao_apertada else "Nenhum cronograma cabe nesse prazo.")
+        if csp_apertado.viavel:
+            stats_cbj = csp_apertado.estatisticas_busca
+            print(f"Nós explorados: {stats_cbj['nos_explorados']}, saltos: {stats_cbj['saltos']}, "
+                  f"nogoods aprendidos: {stats_cbj['nogoods_aprendidos']}, "
+                  f"podas por nogood: {stats_cbj['podas_por_nogood']}")
+
+
+    # Portfólio: várias heurísticas em paralelo, vale a primeira que responder
+    print("\nBuscando com o portfólio paralelo de heurísticas...")
+    solucao_portfolio, stats_portfolio = resolver_com_portfolio(csp_reforma, semente=42)
+    if solucao_portfolio:
+        makespan_portfolio = max(fim for _, fim in solucao_portfolio.values())
+        print(f"Estratégia vencedora: {stats_portfolio['estrategia_vencedora']} "
+              f"(duração {makespan_portfolio} dias, {stats_portfolio['nos_explorados']} nós, "
+              f"{stats_portfolio['reinicios']} reinícios, {stats_portfolio['tempo_segundos']:.2f}s)")
+    else:
+        print("Nenhum cronograma encontrado pelo portfólio.")
\ No newline at end of file